@@ -2,9 +2,9 @@
 
 from .utils import binomial_put_from_call as put_from_call
 from .binomial import BinomialTree
-from .gbm import GBM
-from .black_scholes import  BlackScholes
+from .gbm import GBM, CorrelatedGBM
+from .black_scholes import  BlackScholes, implied_volatility
 from .vasicek import Vasicek
 from .returns import Returns
 
-__all__ = ["put_from_call", "BinomialTree", "GBM","BlackScholes","Vasicek","Returns"]
\ No newline at end of file
+__all__ = ["put_from_call", "BinomialTree", "GBM","CorrelatedGBM","BlackScholes","implied_volatility","Vasicek","Returns"]
\ No newline at end of file
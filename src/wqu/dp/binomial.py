@@ -13,7 +13,8 @@ import numpy as np
 # ------------------------------------------
 # Binomial Tree for Options Pricing
 # Main class: BinomialTree
-# Note: 'asian' style treated as European-style Asian option (exercise at maturity only)
+# Note: 'asian' style is an arithmetic-average option, exercised at maturity only unless
+#       asian_exercise='american'; it is priced on a Hull-White grid of n_averages averages per node
 # ------------------------------------------
 
 class BinomialTree:
@@ -29,6 +30,8 @@ class BinomialTree:
     - N  : int   : Number of time steps
     - option_type : str : 'call' or 'put'
     - option_style : str : 'european', 'american', or 'asian'
+    - n_averages : int : Number of representative averages per node used to price 'asian' options
+    - asian_exercise : str : 'european' or 'american' exercise for 'asian' options
     """
     def __init__(self,
                     S0: float,
@@ -40,6 +43,8 @@ class BinomialTree:
                     N: int,
                     option_type: str = 'call',
                     option_style: str = 'european', # 'american' or 'european' or 'asian'
+                    n_averages: int = 50, # representative averages per node (asian only)
+                    asian_exercise: str = 'european', # 'european' or 'american' (asian only)
                  ):
         self.S0 = S0
         self.K = K
@@ -51,6 +56,8 @@ class BinomialTree:
         self.dt = T / N
         self.option_type = option_type.lower()
         self.option_style = option_style.lower()
+        self.n_averages = n_averages
+        self.asian_exercise = asian_exercise.lower()
         self.p = (np.exp(r * self.dt) - d) / (u - d)
         self.discount = np.exp(-r * self.dt) # Discount factor for one time step
 
@@ -59,44 +66,130 @@ class BinomialTree:
         self.delta_tree = None
 
 
+    @classmethod
+    def leisen_reimer(cls, S0: float, K: float, T: float, r: float, sigma: float, N: int,
+                      option_type: str = 'call', option_style: str = 'european', **kwargs):
+        """
+        Build a tree with Leisen-Reimer up/down factors instead of supplying u and d.
+
+        The lattice is centred on the strike, so European prices converge at O(1/N^2)
+        without the odd-even oscillation of CRR trees. An even N is raised by one.
+
+        Parameters:
+        - sigma : float : Volatility of the underlying
+        - kwargs : Further BinomialTree arguments (e.g. n_averages)
+        """
+        from wqu.pricing.utils import leisen_reimer_parameters
+
+        if N % 2 == 0:
+            N += 1
+        u, d, _ = leisen_reimer_parameters(S0, K, T, r, sigma, N)
+        return cls(S0, K, T, r, u, d, N, option_type, option_style, **kwargs)
+
     def build_stock_tree(self):
-        S = np.zeros((self.N + 1, self.N + 1))
-        for t in range(self.N + 1):
-            for i in range(t + 1):
-                S[t, i] = self.S0 * (self.u ** i) * (self.d ** (t - i))
+        t = np.arange(self.N + 1)[:, None]
+        i = np.arange(self.N + 1)[None, :]
+        # S[t, i] = S0 * u^i * d^(t-i) on and below the diagonal, zero above it
+        S = np.tril(self.S0 * (self.u ** i) * (self.d ** np.maximum(t - i, 0)))
         self.stock_tree = S
         return S
 
-    def _build_asian_option_tree(self):
-        from collections import defaultdict
+    @staticmethod
+    def _geometric_sum(x, n):
+        # sum_{k=0}^{n-1} x^k for an array of term counts n
+        if x == 1:
+            return n.astype(float)
+        return (x ** n - 1) / (x - 1)
 
-        values = defaultdict(list)  # key: (t, i), value: list of (sum, prob)
-        values[(0, 0)].append((self.S0, 1))
+    def _layer_stock_prices(self, t):
+        i = np.arange(t + 1)
+        return self.S0 * np.exp(i * np.log(self.u) + (t - i) * np.log(self.d))
 
-        for t in range(1, self.N + 1):
-            for i in range(t + 1):
-                if i < t:
-                    for sum_s, prob in values[(t - 1, i)]:
-                        S = self.S0 * (self.u ** i) * (self.d ** (t - 1 - i))
-                        new_sum = sum_s + S * self.d
-                        values[(t, i)].append((new_sum, prob * (1 - self.p)))
-                if i > 0:
-                    for sum_s, prob in values[(t - 1, i - 1)]:
-                        S = self.S0 * (self.u ** (i - 1)) * (self.d ** (t - i))
-                        new_sum = sum_s + S * self.u
-                        values[(t, i)].append((new_sum, prob * self.p))
-
-        payoff = 0
-        for i in range(self.N + 1):
-            for sum_s, prob in values[(self.N, i)]:
-                avg = sum_s / (self.N + 1)
-                if self.option_type == 'call':
-                    payoff += prob * max(avg - self.K, 0)
-                else:
-                    payoff += prob * max(self.K - avg, 0)
-
-        self.option_tree = np.zeros_like(self.build_stock_tree())
-        self.option_tree[0, 0] = payoff * np.exp(-self.r * self.T)
+    def _average_grid(self, t):
+        """
+        Representative running averages for every node of time step t.
+
+        The smallest average at node (t, i) comes from the path that goes down first,
+        the largest from the path that goes up first. M = n_averages points are spread
+        geometrically between the two.
+
+        Returns:
+        - log_lo : np.ndarray : log of the smallest average per node, shape (t+1,)
+        - step   : np.ndarray : log spacing of the grid per node, shape (t+1,)
+        - grid   : np.ndarray : the averages themselves, shape (t+1, M)
+        """
+        i = np.arange(t + 1)
+        u, d = self.u, self.d
+        max_sum = self.S0 * self._geometric_sum(u, i + 1) + self.S0 * u ** i * d * self._geometric_sum(d, t - i)
+        min_sum = self.S0 * self._geometric_sum(d, t - i + 1) + self.S0 * d ** (t - i) * u * self._geometric_sum(u, i)
+        log_lo = np.log(np.minimum(min_sum, max_sum) / (t + 1))
+        step = np.abs(np.log(max_sum / min_sum)) / (self.n_averages - 1)
+        step[[0, -1]] = 0  # the outermost nodes are reached by a single path
+        grid = np.exp(log_lo[:, None] + step[:, None] * np.arange(self.n_averages)[None, :])
+        return log_lo, step, grid
+
+    @staticmethod
+    def _interpolate(log_lo, step, values, x):
+        """
+        Row-wise linear interpolation of values, defined on the geometric grids (log_lo, step),
+        at the points x. Points outside a grid are clamped to it.
+        """
+        M = values.shape[1]
+        log_lo, step = log_lo[:, None], step[:, None]
+        # Geometric grids let us find the bracketing index from a log ratio instead of a search
+        pos = np.zeros_like(x)
+        np.divide(np.log(x) - log_lo, step, out=pos, where=step > 0)
+        np.clip(pos, 0, M - 1, out=pos)
+        lo = np.minimum(pos.astype(np.intp), M - 2)
+        g_lo = np.exp(log_lo + lo * step)
+        g_hi = g_lo * np.exp(step)
+        w = np.zeros_like(x)
+        np.divide(x - g_lo, g_hi - g_lo, out=w, where=g_hi > g_lo)
+        np.clip(w, 0, 1, out=w)
+        v_lo = np.take_along_axis(values, lo, axis=1)
+        v_hi = np.take_along_axis(values, lo + 1, axis=1)
+        return v_lo + w * (v_hi - v_lo)
+
+    def _price_asian(self):
+        """
+        Hull-White style pricing of an arithmetic-average Asian option.
+
+        Each node (t, i) carries option values for a fixed grid of M = n_averages representative
+        running averages (of the t+1 prices S_0..S_t). Rolling back one step, the average reached
+        after an up or down move is located on the successor node's grid and its option value is
+        interpolated. The cost is O(N^2 * M). Interpolation error builds up over the steps,
+        so M should grow with N (M of the order of N keeps the error small).
+        With asian_exercise='american' the option may be exercised at any node against the
+        running average observed so far.
+        """
+        sign = self._payoff_sign()
+        if self.asian_exercise not in ('european', 'american'):
+            raise ValueError("asian_exercise must be either 'european' or 'american'")
+        if self.n_averages < 2:
+            raise ValueError("n_averages must be at least 2")
+        american = self.asian_exercise == 'american'
+
+        log_lo_next, step_next, grid = self._average_grid(self.N)
+        V = np.maximum(0, sign * (grid - self.K))
+
+        for t in reversed(range(self.N)):
+            log_lo, step, grid = self._average_grid(t)
+            S_next = self._layer_stock_prices(t + 1)
+            # Running average after the next move, for every (node, grid point) of step t
+            A_up = ((t + 1) * grid + S_next[1:, None]) / (t + 2)
+            A_down = ((t + 1) * grid + S_next[:-1, None]) / (t + 2)
+            V_up = self._interpolate(log_lo_next[1:], step_next[1:], V[1:], A_up)
+            V_down = self._interpolate(log_lo_next[:-1], step_next[:-1], V[:-1], A_down)
+            V = self.discount * (self.p * V_up + (1 - self.p) * V_down)
+            if american:
+                np.maximum(V, sign * (grid - self.K), out=V)
+            log_lo_next, step_next = log_lo, step
+
+        return float(V[0, 0])
+
+    def _build_asian_option_tree(self):
+        self.option_tree = np.zeros((self.N + 1, self.N + 1))
+        self.option_tree[0, 0] = self._price_asian()
         return self.option_tree
 
     def build_option_tree(self):
@@ -106,35 +199,22 @@ class BinomialTree:
         if self.stock_tree is None:
             self.build_stock_tree()
 
+        sign = self._payoff_sign()
+        if self.option_style not in ('european', 'american'):
+            raise ValueError("option_style must be either 'european' or 'american'")
+
         C = np.zeros_like(self.stock_tree)
 
         # Terminal values
-        for i in range(self.N + 1):
-            ST = self.stock_tree[self.N, i]
-            if self.option_type == 'call':
-                C[self.N, i] = max(0, ST - self.K)
-            elif self.option_type == 'put':
-                C[self.N, i] = max(0, self.K - ST)
-            else:
-                raise ValueError("option_type must be either 'call' or 'put'")
+        C[self.N, :] = np.maximum(0, sign * (self.stock_tree[self.N, :] - self.K))
 
-        # Backward induction
+        # Backward induction, one time step (row) at a time
         for t in reversed(range(self.N)):
-            for i in range(t+1):
-                expected = self.discount * (self.p * C[t + 1, i + 1] + (1 - self.p) * C[t + 1, i])
-                if self.option_style == 'european':
-                    C[t, i] = expected
-                elif self.option_style == 'american':
-                    ST = self.stock_tree[t, i]
-                    if self.option_type == 'call':
-                        immediate = max(0, ST - self.K)
-                    elif self.option_type == 'put':
-                        immediate = max(0, self.K - ST)
-                    else:
-                        raise ValueError("option_type must be either 'call' or 'put'")
-                    C[t, i] = max(expected, immediate)
-                else:
-                    raise ValueError("option_style must be either 'european' or 'american'")
+            expected = self.discount * (self.p * C[t + 1, 1:t + 2] + (1 - self.p) * C[t + 1, :t + 1])
+            if self.option_style == 'american':
+                immediate = np.maximum(0, sign * (self.stock_tree[t, :t + 1] - self.K))
+                expected = np.maximum(expected, immediate)
+            C[t, :t + 1] = expected
         self.option_tree = C
         return C
 
@@ -239,7 +319,177 @@ class BinomialTree:
 
         return hedge_value, option_payoff, hedge_error
 
-    def price(self):
+    def simulate_delta_hedges(self, moves=None, n_paths: int = None, seed: int = None):
+        """
+        Vectorized version of simulate_delta_hedge over many paths at once.
+
+        Paths are taken, in order of precedence, from:
+        - moves   : 2-D array of shape (M, N) with 1/'u' for up and 0/'d' for down moves
+        - n_paths : number of paths sampled with the risk-neutral probability p
+        - neither : all 2^N paths are enumerated (exact distribution, N <= 22, which takes about 0.7 GB)
+
+        The rebalancing follows simulate_delta_hedge exactly, for every path at the same time.
+
+        Parameters:
+        - moves   : array-like : Up/down moves per path
+        - n_paths : int : Number of paths to sample when moves is not given
+        - seed    : int : Seed for the sampled paths (optional)
+
+        Returns:
+        - dict with
+          - moves         : np.ndarray : (M, N) array of 1 (up) / 0 (down) moves
+          - probabilities : np.ndarray : Weight of each path (risk-neutral probability when
+                                         enumerated, 1/M when given or sampled)
+          - hedge_value   : np.ndarray : Portfolio value at maturity per path
+          - option_payoff : np.ndarray : Option payoff per path
+          - hedge_error   : np.ndarray : hedge_value - option_payoff per path
+          - summary       : dict : Weighted mean, std, min and max of the hedge error
+        """
+        if self.option_style == 'asian':
+            raise ValueError("Delta hedging needs the full option tree, which 'asian' options do not have")
+        sign = self._payoff_sign()
+
+        if moves is not None:
+            moves = np.asarray(moves)
+            if moves.ndim != 2 or moves.shape[1] != self.N:
+                raise ValueError("moves must be a 2-D array with N columns")
+            if moves.dtype.kind in 'US':
+                if not np.isin(moves, ('u', 'd')).all():
+                    raise ValueError("Path must be a sequence of 'u' and 'd' only.")
+                moves = moves == 'u'
+            elif not np.isin(moves, (0, 1)).all():
+                raise ValueError("moves must be 1/'u' (up) or 0/'d' (down) only.")
+            moves = moves.astype(np.int8)
+            probabilities = np.full(moves.shape[0], 1 / moves.shape[0])
+        elif n_paths is not None:
+            rng = np.random.default_rng(seed)
+            moves = (rng.random((n_paths, self.N)) < self.p).astype(np.int8)
+            probabilities = np.full(n_paths, 1 / n_paths)
+        else:
+            if self.N > 22:
+                raise ValueError("Enumerating all 2^N paths is limited to N <= 22; pass moves or n_paths instead")
+            # Bit t of path code c is its move at step t, unpacked straight to one byte per move
+            codes = np.arange(2 ** self.N, dtype='<u4')
+            bits = np.unpackbits(codes.view(np.uint8).reshape(-1, 4), axis=1, bitorder='little')
+            moves = np.ascontiguousarray(bits[:, :self.N]).view(np.int8)
+            del bits
+            ups = moves.sum(axis=1)
+            probabilities = self.p ** ups * (1 - self.p) ** (self.N - ups)
+
+        if self.delta_tree is None:
+            self.build_delta_tree()
+
+        i = np.zeros(moves.shape[0], dtype=np.intp)
+        # initial hedge at the root
+        shares_held = np.full(moves.shape[0], self.delta_tree[0, 0])
+        cash = -shares_held * self.stock_tree[0, 0]
+
+        for t in range(self.N):
+            delta_now = self.delta_tree[t, i]
+            stock_now = self.stock_tree[t, i]
+            i += moves[:, t]
+            delta_next = self.delta_tree[t + 1, i] if t + 1 < self.N else np.zeros_like(delta_now)
+            cash -= (delta_next - delta_now) * stock_now
+            shares_held = delta_next
+
+        stock_final = self.stock_tree[self.N, i]
+        hedge_value = shares_held * stock_final + cash
+        option_payoff = np.maximum(0, sign * (stock_final - self.K))
+        hedge_error = hedge_value - option_payoff
+
+        mean = np.sum(probabilities * hedge_error)
+        summary = {
+            "mean": mean,
+            "std": np.sqrt(np.sum(probabilities * (hedge_error - mean) ** 2)),
+            "min": hedge_error.min(),
+            "max": hedge_error.max(),
+        }
+        return {
+            "moves": moves,
+            "probabilities": probabilities,
+            "hedge_value": hedge_value,
+            "option_payoff": option_payoff,
+            "hedge_error": hedge_error,
+            "summary": summary,
+        }
+
+    def _payoff_sign(self):
+        # +1 for calls, -1 for puts: payoff = max(0, sign * (S - K))
+        if self.option_type == 'call':
+            return 1.0
+        elif self.option_type == 'put':
+            return -1.0
+        raise ValueError("option_type must be either 'call' or 'put'")
+
+    def _price_rolling(self, K, sign):
+        """
+        Price-only backward induction on a single 1-D value array.
+
+        Only the current time slice of option values (and, for American
+        exercise, of stock prices) is kept, so memory is O(N) and each step
+        is a single NumPy slicing operation. K and sign may be column vectors
+        of shape (m, 1), in which case m options on the same lattice are
+        rolled back together as an (m, N+1) array.
+        """
+        if self.option_style not in ('european', 'american'):
+            raise ValueError("option_style must be either 'european' or 'american'")
+        american = self.option_style == 'american'
+
+        # Terminal stock prices S0 * u^i * d^(N-i), computed in log space so large N does not overflow
+        i = np.arange(self.N + 1)
+        S = self.S0 * np.exp(i * np.log(self.u) + (self.N - i) * np.log(self.d))
+        V = np.maximum(0, sign * (S - K))
+
+        pu = self.discount * self.p
+        pd = self.discount * (1 - self.p)
+        for _ in range(self.N):
+            V = pu * V[..., 1:] + pd * V[..., :-1]
+            if american:
+                S = S[:-1] / self.d  # S[t, i] = S[t + 1, i] / d
+                np.maximum(V, sign * (S - K), out=V)
+        return V[..., 0]
+
+    def price_chain(self, strikes, option_types=None):
+        """
+        Price a whole option chain on this tree's lattice in one backward pass.
+
+        The tree's S0, T, r, u, d, N and option_style are shared by all options; its own K and
+        option_type are ignored. All strikes are rolled back together as a (strikes x nodes) array.
+
+        Parameters:
+        - strikes : array-like : Strike prices
+        - option_types : str or sequence of str : 'call' or 'put' for every strike, or one value
+          for all of them (default: the tree's option_type)
+
+        Returns:
+        - prices : np.ndarray : Option prices at t=0, aligned with strikes
+        """
+        if self.option_style == 'asian':
+            raise ValueError("price_chain supports only 'european' and 'american' options")
+        K = np.asarray(strikes, dtype=float).reshape(-1, 1)
+        if option_types is None:
+            option_types = self.option_type
+        types = np.broadcast_to(np.char.lower(np.asarray(option_types, dtype=str)), (K.shape[0],))
+        if not np.isin(types, ('call', 'put')).all():
+            raise ValueError("option_type must be either 'call' or 'put'")
+        sign = np.where(types == 'call', 1.0, -1.0).reshape(-1, 1)
+        return self._price_rolling(K, sign)
+
+    def price(self, full_tree: bool = True):
+        """
+        Price of the option at t=0.
+
+        Parameters:
+        - full_tree : bool : If True (default), build and keep the full (N+1)x(N+1) option tree,
+          which `build_delta_tree` and `simulate_delta_hedge` rely on. If False, use the O(N)-memory
+          rolling engine instead; nothing is stored on the instance, which makes N in the tens of
+          thousands practical for European and American options. 'asian' options are priced on
+          their average grid either way; only the root of option_tree is filled for them.
+        """
+        if not full_tree and self.option_tree is None:
+            if self.option_style == 'asian':
+                return self._price_asian()
+            return float(self._price_rolling(self.K, self._payoff_sign()))
         if self.option_tree is None:
             self.build_option_tree()
         return self.option_tree[0, 0]
@@ -2,14 +2,38 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.special import ndtri
+from scipy.stats import qmc as _qmc
 
 # ------------------------------------------
 # Geometric Brownian Motion (GBM)
 # A class representing the GBM process for simulating stock prices.
 # ------------------------------------------
 
+def _brownian_bridge(N: int) -> list:
+    """
+    Internal: Construction order of a Brownian bridge on the steps 0..N, in units of one step.
+
+    W_N is drawn first, then the midpoints of ever finer intervals, so the first dimensions of a
+    quasi-random point fix the coarse shape of the path. Each entry (i, left, right, a, b, s) sets
+    W_i = a W_left + b W_right + s Z from the next normal Z.
+    """
+    schedule = [(N, 0, N, 0.0, 0.0, np.sqrt(N))]
+    intervals = [(0, N)]
+    for left, right in intervals:
+        if right - left < 2:
+            continue
+        i = (left + right) // 2
+        width = right - left
+        schedule.append((i, left, right, (right - i) / width, (i - left) / width,
+                         np.sqrt((i - left) * (right - i) / width)))
+        intervals += [(left, i), (i, right)]
+    return schedule
+
+
 class GBM:
-    def __init__(self, S0: float, mu: float, sigma: float, T: float = 1.0, N: int = 252, seed: int = None):
+    def __init__(self, S0: float, mu: float, sigma: float, T: float = 1.0, N: int = 252, seed: int = None,
+                 rng: np.random.Generator = None):
         """
         Initialize the GBM simulation parameters.
 
@@ -19,7 +43,8 @@ class GBM:
         - sigma: Volatility
         - T: Total time in years (e.g., 1.0 for one year)
         - N: Number of time steps (e.g., 252 for daily over a year)
-        - seed: Random seed for reproducibility (optional)
+        - seed: Random seed for reproducibility (optional); seeds this instance's generator only
+        - rng: numpy.random.Generator to draw from (optional, overrides seed)
         """
         self.S0 = S0
         self.mu = mu
@@ -28,51 +53,144 @@ class GBM:
         self.N = N
         self.dt = T / N
         self.t = np.linspace(0, T, N + 1)
-        if seed is not None:
-            np.random.seed(seed)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
 
-    def simulate(self, method: str = "exact") -> np.ndarray:
+    def simulate(self, M: int = None, method: str = "exact", dtype=np.float64,
+                 rng: np.random.Generator = None, chunk_size: int = None, qmc: bool = False) -> np.ndarray:
         """
-        Simulate a single GBM path using the specified method.
+        Simulate GBM paths using the specified method.
+
+        With qmc=True the paths come from one randomly scrambled Sobol sequence in N dimensions,
+        mapped to Brownian paths with a Brownian bridge. Averages over the paths then converge
+        close to O(1/M) for smooth payoffs instead of O(1/sqrt(M)); M should be a power of 2.
+        A single scrambled set has no usable sample variance, so use estimate() to get an
+        error bar from independent scrambles.
 
         Parameters:
+        - M: Number of paths; None (default) returns a single path
         - method: 'exact' (default) or 'euler'
+        - dtype: np.float64 (default) or np.float32
+        - rng: numpy.random.Generator to draw from (default: the instance's generator)
+        - chunk_size: Number of paths filled at a time, which bounds the temporary memory
+          (default: about one million prices per chunk)
+        - qmc: Use scrambled Sobol points with a Brownian bridge instead of pseudo-random draws
 
         Returns:
-        - A NumPy array of length N+1 representing the price path: [S_0, S_1, ..., S_N]
+        - A NumPy array of shape (M, N+1) of price paths [S_0, S_1, ..., S_N],
+          or of length N+1 if M is None
         """
-        if method == "exact":
-            return self._simulate_exact()
-        elif method == "euler":
-            return self._simulate_euler()
-        else:
+        if method not in ("exact", "euler"):
             raise ValueError("Method must be 'exact' or 'euler'.")
+        rng = rng if rng is not None else self.rng
+        n_paths = 1 if M is None else M
+        chunk_size = chunk_size or max(1, 2**20 // self.N)
+        if qmc:
+            # Sobol points keep their balance when drawn in blocks of a power of 2
+            chunk_size = 1 << (chunk_size.bit_length() - 1)
+            sobol = _qmc.Sobol(self.N, scramble=True, rng=rng)
+            bridge = _brownian_bridge(self.N)
+
+        paths = np.empty((n_paths, self.N + 1), dtype=dtype)
+        paths[:, 0] = self.S0
+        for start in range(0, n_paths, chunk_size):
+            rows = paths[start:start + chunk_size]
+            if qmc:
+                Z = self._bridge_increments(sobol, bridge, rows.shape[0]).astype(dtype, copy=False)
+            else:
+                Z = rng.standard_normal((rows.shape[0], self.N), dtype=dtype)
+            if method == "exact":
+                self._simulate_exact(Z, rows[:, 1:])
+            else:
+                self._simulate_euler(Z, rows[:, 1:])
+        return paths[0] if M is None else paths
 
-    def _simulate_exact(self) -> np.ndarray:
+    def _bridge_increments(self, sobol: _qmc.Sobol, bridge: list, n: int) -> np.ndarray:
         """
-        Internal: Simulate GBM using the exact analytical solution.
+        Internal: Standard normal increments of n Brownian paths built from the next n Sobol points.
+
+        Parameters:
+        - sobol: Scrambled Sobol engine in N dimensions
+        - bridge: Construction order from _brownian_bridge(N)
+        - n: Number of paths
 
         Returns:
-        - A NumPy array of prices of length N+1 including S0
+        - Array of shape (n, N) of increments W_i - W_(i-1) of a unit-variance-per-step Brownian motion
         """
-        dW = np.random.randn(self.N) * np.sqrt(self.dt)
-        W = np.concatenate(([0], np.cumsum(dW)))  # W_0 = 0
-        S = self.S0 * np.exp((self.mu - 0.5 * self.sigma**2) * self.t + self.sigma * W)
-        return S
+        # Scrambled points lie on a grid of 2^-bits that includes 0; use the cell midpoints
+        X = ndtri(sobol.random(n) + 0.5 / 2**sobol.bits)
+        W = np.zeros((self.N + 1, n))
+        for k, (i, left, right, a, b, s) in enumerate(bridge):
+            W[i] = a * W[left] + b * W[right] + s * X[:, k]
+        return np.ascontiguousarray(np.diff(W, axis=0).T)
 
-    def _simulate_euler(self) -> np.ndarray:
+    def estimate(self, payoff, M: int = 4096, replicates: int = 16, method: str = "exact",
+                 qmc: bool = True, dtype=np.float64, rng: np.random.Generator = None) -> tuple:
         """
-        Internal: Simulate GBM using Euler-Maruyama approximation.
+        Estimate the expectation of a path functional with its standard error.
+
+        The functional is averaged over M paths in each of several independent replicates, each
+        from its own scrambling of the Sobol sequence when qmc=True. The replicate averages are
+        i.i.d. and unbiased, so their spread gives the standard error that a single low-discrepancy
+        set cannot.
+
+        Parameters:
+        - payoff: Function mapping an (M, N+1) array of paths to M values
+        - M: Number of paths per replicate (a power of 2 with qmc=True)
+        - replicates: Number of independent replicates (at least 2)
+        - method: 'exact' (default) or 'euler'
+        - qmc: Use scrambled Sobol points with a Brownian bridge (default True)
+        - dtype: np.float64 (default) or np.float32
+        - rng: numpy.random.Generator for the scrambles or draws (default: the instance's generator)
 
         Returns:
-        - A NumPy array of prices of length N+1 including S0
+        - (estimate, standard error)
+        """
+        if replicates < 2:
+            raise ValueError("replicates must be at least 2")
+        rng = rng if rng is not None else self.rng
+        means = np.array([
+            np.mean(payoff(self.simulate(M, method=method, dtype=dtype, rng=rng, qmc=qmc)))
+            for _ in range(replicates)
+        ])
+        return means.mean(), means.std(ddof=1) / np.sqrt(replicates)
+
+    def _simulate_exact(self, Z: np.ndarray, out: np.ndarray) -> np.ndarray:
         """
-        S = np.zeros(self.N + 1)
-        S[0] = self.S0
-        for i in range(1, self.N + 1):
-            dW = np.random.randn() * np.sqrt(self.dt)
-            S[i] = S[i - 1] + self.mu * S[i - 1] * self.dt + self.sigma * S[i - 1] * dW
-        return S
+        Internal: Simulate GBM using the exact analytical solution,
+        S_t = S_0 * exp((mu - sigma^2 / 2) t + sigma W_t), with W_t the cumulative sum of
+        the Brownian increments.
+
+        Parameters:
+        - Z: Standard normal draws of shape (paths, N)
+        - out: Array of shape (paths, N) receiving S_1..S_N
+
+        Returns:
+        - out
+        """
+        Z *= self.sigma * np.sqrt(self.dt)
+        Z += (self.mu - 0.5 * self.sigma**2) * self.dt
+        np.cumsum(Z, axis=1, out=out)
+        np.exp(out, out=out)
+        out *= self.S0
+        return out
+
+    def _simulate_euler(self, Z: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Internal: Simulate GBM using Euler-Maruyama approximation,
+        S_i = S_(i-1) * (1 + mu dt + sigma dW_i), as a cumulative product over all steps at once.
+
+        Parameters:
+        - Z: Standard normal draws of shape (paths, N)
+        - out: Array of shape (paths, N) receiving S_1..S_N
+
+        Returns:
+        - out
+        """
+        Z *= self.sigma * np.sqrt(self.dt)
+        Z += 1 + self.mu * self.dt
+        np.cumprod(Z, axis=1, out=out)
+        out *= self.S0
+        return out
 
     def plot(self, M: int = 10, method: str = "exact", alpha: float = 0.3, **kwargs):
         """
@@ -87,11 +205,10 @@ class GBM:
         figsize = kwargs.pop("figsize", (10, 5))
         plt.figure(figsize=figsize)
 
-        for i in range(M):
-            S = self.simulate(method=method)
-            label = f"{method.capitalize()} Method" if i == 0 else None
-            line_alpha = 1.0 if M == 1 else alpha
-            plt.plot(self.t, S, label=label, alpha=line_alpha, **kwargs)
+        paths = self.simulate(M=M, method=method)
+        line_alpha = 1.0 if M == 1 else alpha
+        lines = plt.plot(self.t, paths.T, alpha=line_alpha, **kwargs)
+        lines[0].set_label(f"{method.capitalize()} Method")
 
         plt.title(f"{M} GBM Path{'s' if M > 1 else ''} - {method.capitalize()} Method")
         plt.xlabel("Time (years)")
@@ -100,4 +217,161 @@ class GBM:
         if M == 1:
             plt.legend()
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+
+class CorrelatedGBM:
+    def __init__(self, S0, mu, sigma, corr: np.ndarray = None, loadings: np.ndarray = None, T: float = 1.0,
+                 N: int = 252, seed: int = None, rng: np.random.Generator = None):
+        """
+        Initialize a multi-asset GBM with correlated Brownian motions.
+
+        Each asset follows dS_i = mu_i S_i dt + sigma_i S_i dW_i. The correlation of the W_i is given
+        either as a full matrix, which is factored once by Cholesky (O(d^2) work per time step),
+        or through a factor model for large universes: with a (d, k) loading matrix B,
+        dW = B dF + sqrt(1 - |B_i|^2) dE with k common factors F and independent residuals E,
+        so corr = B B^T off the diagonal and each time step costs O(d k). With neither,
+        the assets are independent.
+
+        Parameters:
+        - S0: Initial prices, shape (d,)
+        - mu: Expected returns (drifts), shape (d,) or a scalar
+        - sigma: Volatilities, shape (d,) or a scalar
+        - corr: Correlation matrix, shape (d, d) (optional)
+        - loadings: Factor loading matrix, shape (d, k), rows of norm at most 1 (optional)
+        - T: Total time in years (e.g., 1.0 for one year)
+        - N: Number of time steps (e.g., 252 for daily over a year)
+        - seed: Random seed for reproducibility (optional); seeds this instance's generator only
+        - rng: numpy.random.Generator to draw from (optional, overrides seed)
+        """
+        self.S0 = np.atleast_1d(np.asarray(S0, dtype=float))
+        self.n_assets = self.S0.size
+        self.mu = np.broadcast_to(np.asarray(mu, dtype=float), self.S0.shape)
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=float), self.S0.shape)
+        self.T = T
+        self.N = N
+        self.dt = T / N
+        self.t = np.linspace(0, T, N + 1)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+        if corr is not None and loadings is not None:
+            raise ValueError("Give either corr or loadings, not both.")
+        self.chol = None
+        self.loadings = None
+        if corr is not None:
+            corr = np.asarray(corr, dtype=float)
+            if corr.shape != (self.n_assets, self.n_assets):
+                raise ValueError("corr must have shape (n_assets, n_assets).")
+            try:
+                self.chol = np.linalg.cholesky(corr)
+            except np.linalg.LinAlgError:
+                # Positive semi-definite (e.g. perfectly correlated assets): use the eigendecomposition
+                values, vectors = np.linalg.eigh(corr)
+                if values.min() < -1e-10:
+                    raise ValueError("corr must be positive semi-definite.")
+                self.chol = vectors * np.sqrt(np.clip(values, 0, None))
+        elif loadings is not None:
+            loadings = np.asarray(loadings, dtype=float).reshape(self.n_assets, -1)
+            residual = 1 - np.sum(loadings ** 2, axis=1)
+            if residual.min() < -1e-12:
+                raise ValueError("Each row of loadings must have norm at most 1.")
+            self.loadings = loadings
+            self.residual = np.sqrt(np.clip(residual, 0, None))
+
+        self._drift = (self.mu - 0.5 * self.sigma ** 2) * self.dt
+        self._vol = self.sigma * np.sqrt(self.dt)
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """
+        Correlation matrix of the Brownian motions, shape (d, d).
+        """
+        if self.chol is not None:
+            return self.chol @ self.chol.T
+        if self.loadings is not None:
+            corr = self.loadings @ self.loadings.T
+            np.fill_diagonal(corr, 1.0)
+            return corr
+        return np.eye(self.n_assets)
+
+    def _shocks(self, rng: np.random.Generator, n: int, dtype=np.float64) -> np.ndarray:
+        """
+        Internal: n rows of correlated standard normals, shape (n, d).
+        """
+        if self.loadings is not None:
+            factors = rng.standard_normal((n, self.loadings.shape[1]), dtype=dtype)
+            Z = rng.standard_normal((n, self.n_assets), dtype=dtype)
+            Z *= self.residual.astype(dtype)
+            Z += factors @ self.loadings.T.astype(dtype)
+            return Z
+        Z = rng.standard_normal((n, self.n_assets), dtype=dtype)
+        return Z if self.chol is None else Z @ self.chol.T.astype(dtype)
+
+    def simulate_chunks(self, M: int, chunk_size: int = None, dtype=np.float64, rng: np.random.Generator = None):
+        """
+        Generate price paths chunk by chunk.
+
+        Parameters:
+        - M: Number of paths
+        - chunk_size: Number of paths per chunk (default: about one million prices per chunk)
+        - dtype: np.float64 (default) or np.float32
+        - rng: numpy.random.Generator to draw from (default: the instance's generator)
+
+        Yields:
+        - Arrays of shape (m, N+1, d) of price paths [S_0, S_1, ..., S_N] with m <= chunk_size
+        """
+        rng = rng if rng is not None else self.rng
+        chunk_size = chunk_size or max(1, 2**20 // (self.N * self.n_assets))
+        drift, vol = self._drift.astype(dtype), self._vol.astype(dtype)
+        for start in range(0, M, chunk_size):
+            m = min(chunk_size, M - start)
+            log_returns = self._shocks(rng, m * self.N, dtype).reshape(m, self.N, self.n_assets)
+            log_returns *= vol
+            log_returns += drift
+            paths = np.empty((m, self.N + 1, self.n_assets), dtype=dtype)
+            paths[:, 0] = self.S0
+            np.cumsum(log_returns, axis=1, out=paths[:, 1:])
+            np.exp(paths[:, 1:], out=paths[:, 1:])
+            paths[:, 1:] *= self.S0.astype(dtype)
+            yield paths
+
+    def simulate(self, M: int = None, chunk_size: int = None, dtype=np.float64,
+                 rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Simulate correlated price paths with the exact solution.
+
+        Parameters:
+        - M: Number of paths; None (default) returns a single path
+        - chunk_size: Number of paths filled at a time (see simulate_chunks)
+        - dtype: np.float64 (default) or np.float32
+        - rng: numpy.random.Generator to draw from (default: the instance's generator)
+
+        Returns:
+        - A NumPy array of shape (M, N+1, d), or (N+1, d) if M is None
+        """
+        chunks = list(self.simulate_chunks(1 if M is None else M, chunk_size, dtype, rng))
+        paths = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        return paths[0] if M is None else paths
+
+    def stream(self, M: int, dtype=np.float64, rng: np.random.Generator = None):
+        """
+        Step all M paths forward together, holding only the current cross-section in memory.
+
+        Parameters:
+        - M: Number of paths
+        - dtype: np.float64 (default) or np.float32
+        - rng: numpy.random.Generator to draw from (default: the instance's generator)
+
+        Yields:
+        - Arrays of shape (M, d) of the prices S_0, S_1, ..., S_N, one per time step
+        """
+        rng = rng if rng is not None else self.rng
+        drift, vol = self._drift.astype(dtype), self._vol.astype(dtype)
+        log_S = np.broadcast_to(np.log(self.S0).astype(dtype), (M, self.n_assets)).copy()
+        yield np.exp(log_S)
+        for _ in range(self.N):
+            Z = self._shocks(rng, M, dtype)
+            Z *= vol
+            Z += drift
+            log_S += Z
+            yield np.exp(log_S)
@@ -1,6 +1,7 @@
 # src/wqu/dp/montecarlo.py
 
 import numpy as np
+from wqu.dp.gbm import GBM
 
 # A Class represents the Monte Carlo method for solving the Option pricing problem.
 # ------------------------------------------
@@ -20,7 +21,9 @@ class MonteCarlo:
                  M: int = 10000,
                  option_type: str = 'call',  # 'call' or 'put'
                  option_style: str = 'european',  # 'european' or 'asian'
-                 method: str = 'continuous'  # 'binomial' or 'continuous'
+                 method: str = 'continuous',  # 'binomial' or 'continuous'
+                 qmc: bool = False,  # scrambled Sobol paths with a Brownian bridge (continuous only)
+                 replicates: int = 16  # independent scrambles behind the qmc standard error
                  ):
         self.S0 = S0
         self.K = K
@@ -32,6 +35,9 @@ class MonteCarlo:
         self.option_type = option_type.lower()
         self.option_style = option_style.lower()
         self.method = method.lower()
+        self.qmc = qmc
+        self.replicates = replicates
+        self.std_error = None
 
         if self.option_type not in ["call", "put"]:
             raise ValueError("option_type must be 'call' or 'put'")
@@ -39,8 +45,24 @@ class MonteCarlo:
             raise ValueError("option_style must be 'european' or 'asian'")
         if self.method not in ["continuous", "binomial"]:
             raise ValueError("method must be 'continuous' or 'binomial'")
+        if self.qmc and self.method != 'continuous':
+            raise ValueError("qmc requires method='continuous'")
 
     def price(self):
+        """
+        Estimate the option price.
+
+        With qmc=True the paths come from `replicates` independently scrambled Sobol sets built
+        with a Brownian bridge, and the standard error across the replicate prices is stored in
+        self.std_error. Sobol points are only balanced in powers of 2, so each set holds
+        M // replicates paths rounded down to a power of 2: 16 sets of 512, i.e. 8192 paths in
+        total, at the defaults M=10000 and replicates=16.
+
+        Returns:
+        - float : Estimated option price
+        """
+        if self.qmc:
+            return self._price_qmc()
         if self.option_style == 'european':
             return self._price_european()
         elif self.option_style == 'asian':
@@ -57,13 +79,9 @@ class MonteCarlo:
             u = np.exp(self.sigma * np.sqrt(dt))
             d = np.exp(-self.sigma * np.sqrt(dt))
             p = (np.exp(self.r * dt) - d) / (u - d)
-            ST = np.zeros(self.M)
-            for j in range(self.M):
-                rand = np.random.binomial(1, p, self.N + 1)
-                S = self.S0
-                for i in range(1, self.N + 1):
-                    S *= u if rand[i] == 1 else d
-                ST[j] = S
+            # Only the number of up moves matters for S_T, and it is Binomial(N, p)
+            ups = np.random.binomial(self.N, p, self.M)
+            ST = self.S0 * u ** ups * d ** (self.N - ups)
         else:
             raise ValueError("method must be 'continuous' or 'binomial'")
 
@@ -91,16 +109,15 @@ class MonteCarlo:
             u = np.exp(self.sigma * np.sqrt(dt))
             d = np.exp(-self.sigma * np.sqrt(dt))
             p = (np.exp(self.r * dt) - d) / (u - d)
-            averages = np.zeros(self.M)
+            averages = np.empty(self.M)
 
-            for j in range(self.M):
-                rand = np.random.binomial(1, p, self.N + 1)
-                total = self.S0
-                S = self.S0
-                for i in range(1, self.N + 1):
-                    S *= u if rand[i] == 1 else d
-                    total += S
-                averages[j] = total / (self.N + 1)
+            # Paths are cumulative products of the up/down moves, over chunks of about a million prices
+            paths_per_chunk = max(1, 1_000_000 // self.N)
+            for start in range(0, self.M, paths_per_chunk):
+                m = min(paths_per_chunk, self.M - start)
+                S = np.where(np.random.random_sample((m, self.N)) < p, u, d)
+                np.cumprod(S, axis=1, out=S)
+                averages[start:start + m] = self.S0 * (1 + S.sum(axis=1)) / (self.N + 1)
 
         else:
             raise ValueError("method must be 'continuous' or 'binomial'")
@@ -114,6 +131,125 @@ class MonteCarlo:
 
         return np.exp(-self.r * self.T) * np.mean(payoff)
 
+    def _price_qmc(self):
+        # A European payoff only needs S_T, i.e. a one-step bridge
+        N = 1 if self.option_style == 'european' else self.N
+        # Draw the scrambles from the global state, so np.random.seed still fixes the result
+        rng = np.random.default_rng(np.random.randint(2**32, dtype=np.uint64))
+        gbm = GBM(self.S0, self.r, self.sigma, self.T, N, rng=rng)
+        sign = 1.0 if self.option_type == 'call' else -1.0
+
+        def payoff(paths):
+            X = paths[:, -1] if self.option_style == 'european' else paths.mean(axis=1)
+            return np.exp(-self.r * self.T) * np.maximum(sign * (X - self.K), 0)
+
+        paths_per_set = 1 << (max(1, self.M // self.replicates).bit_length() - 1)
+        price, self.std_error = gbm.estimate(payoff, paths_per_set, self.replicates)
+        return price
+
+    def greeks(self, estimator: str = 'pathwise', chunk_size: int = 1_000_000):
+        """
+        Estimate the price, delta, vega and rho in one simulation pass, with standard errors.
+
+        With method='continuous' the Greeks are pathwise derivatives of the discounted payoff,
+        which is Lipschitz for European and Asian calls and puts; estimator='likelihood_ratio'
+        weights the payoff with the score of the path density instead (noisier, but needs no
+        payoff derivative). With method='binomial' the path probabilities depend on sigma and r
+        through p, so the Greeks combine the pathwise derivative through u and d with the
+        likelihood-ratio score of p.
+
+        Parameters:
+        - estimator : str : 'pathwise' or 'likelihood_ratio' (method='continuous' only)
+        - chunk_size : int : Approximate number of simulated prices held in memory at a time
+
+        Returns:
+        - dict : price, delta, vega and rho, and their standard errors under '<name>_std_error'
+        """
+        estimator = estimator.lower()
+        if estimator not in ["pathwise", "likelihood_ratio"]:
+            raise ValueError("estimator must be 'pathwise' or 'likelihood_ratio'")
+
+        steps = 1 if self.option_style == 'european' and self.method == 'continuous' else self.N
+        paths_per_chunk = max(1, chunk_size // steps)
+        sums = np.zeros((2, 4))
+        done = 0
+        while done < self.M:
+            m = min(paths_per_chunk, self.M - done)
+            samples = self._greek_samples(m, estimator)
+            sums[0] += samples.sum(axis=1)
+            sums[1] += (samples ** 2).sum(axis=1)
+            done += m
+
+        mean = sums[0] / self.M
+        variance = np.maximum(sums[1] - self.M * mean ** 2, 0) / max(self.M - 1, 1)
+        std_error = np.sqrt(variance / self.M)
+        result = {}
+        for name, value, error in zip(["price", "delta", "vega", "rho"], mean, std_error):
+            result[name] = value
+            result[f"{name}_std_error"] = error
+        return result
+
+    def _greek_samples(self, m, estimator):
+        """
+        Per-path estimates of the price, delta, vega and rho for m paths, shape (4, m).
+        """
+        sign = 1.0 if self.option_type == 'call' else -1.0
+        disc = np.exp(-self.r * self.T)
+        dt = self.T / self.N
+
+        if self.method == 'continuous':
+            if self.option_style == 'european':
+                Z = np.random.randn(m, 1)
+                h = np.sqrt(self.T)
+                t = np.array([self.T])
+            else:
+                Z = np.random.randn(m, self.N)
+                h = np.sqrt(dt)
+                t = dt * np.arange(1, self.N + 1)
+            W = h * np.cumsum(Z, axis=1)
+            S = self.S0 * np.exp((self.r - 0.5 * self.sigma ** 2) * t + self.sigma * W)
+            if self.option_style == 'european':
+                X, dX_dsigma, dX_dr = S[:, -1], (S * (W - self.sigma * t))[:, -1], (S * t)[:, -1]
+            else:
+                X = (self.S0 + S.sum(axis=1)) / (self.N + 1)
+                dX_dsigma = (S * (W - self.sigma * t)).sum(axis=1) / (self.N + 1)
+                dX_dr = (S * t).sum(axis=1) / (self.N + 1)
+            price = disc * np.maximum(sign * (X - self.K), 0)
+
+            if estimator == 'likelihood_ratio':
+                delta = price * Z[:, 0] / (self.S0 * self.sigma * h)
+                vega = price * ((Z ** 2 - 1) / self.sigma - Z * h).sum(axis=1)
+                rho = price * (Z.sum(axis=1) * h / self.sigma - self.T)
+                return np.array([price, delta, vega, rho])
+            slope = disc * sign * np.heaviside(sign * (X - self.K), 0.5)
+            return np.array([price, slope * X / self.S0, slope * dX_dsigma, slope * dX_dr - self.T * price])
+
+        # Binomial paths: S_i = S0 * u^(2 k_i - i) with k_i up moves after i steps
+        u = np.exp(self.sigma * np.sqrt(dt))
+        d = 1 / u
+        growth = np.exp(self.r * dt)
+        p = (growth - d) / (u - d)
+        dp_dr = dt * growth / (u - d)
+        dp_dsigma = np.sqrt(dt) * (d * (u - d) - (growth - d) * (u + d)) / (u - d) ** 2
+
+        ups = np.cumsum(np.random.random_sample((m, self.N)) < p, axis=1)
+        moves = 2 * ups - np.arange(1, self.N + 1)
+        S = self.S0 * u ** moves
+        if self.option_style == 'european':
+            X, dX_dsigma = S[:, -1], S[:, -1] * np.sqrt(dt) * moves[:, -1]
+        else:
+            X = (self.S0 + S.sum(axis=1)) / (self.N + 1)
+            dX_dsigma = (S * np.sqrt(dt) * moves).sum(axis=1) / (self.N + 1)
+        price = disc * np.maximum(sign * (X - self.K), 0)
+        slope = disc * sign * np.heaviside(sign * (X - self.K), 0.5)
+        score = ups[:, -1] / p - (self.N - ups[:, -1]) / (1 - p)
+        return np.array([
+            price,
+            slope * X / self.S0,
+            slope * dX_dsigma + price * score * dp_dsigma,
+            price * (score * dp_dr - self.T),
+        ])
+
     def plot_convergence(self, M_values):
         """
         Plot the convergence of the Monte Carlo option price with increasing simulations.
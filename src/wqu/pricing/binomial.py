@@ -1,73 +1,258 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Tuple
-from wqu.pricing.options import OptionType
+from typing import List, Sequence, Tuple, Union
+from wqu.pricing.options import OptionType, OptionStyle, _payoff_signs
+from wqu.pricing.cache import cached_price
+from wqu.pricing.utils import _black_scholes_price, leisen_reimer_parameters
+
+
+def _rollback(S0, u, d, p, disc, K, sign, n_steps: int, american: bool, keep: int = 0, smoothing=None):
+    """
+    Backward induction on a recombining binomial lattice, one row per option.
+
+    Every argument except n_steps and american may be a scalar or a column of
+    shape (m, 1); node j of step i holds S0 * u^(i-j) * d^j as in BinomialTree.
+    Only one time slice of shape (m, nodes) is kept in memory.
+    With smoothing=(r, dt, sigma) the last step is replaced by Black-Scholes
+    values over one period (the BBS tree of Broadie and Detemple).
+
+    Returns:
+        Option values at t=0, shape (m,); or, if keep > 0, the list of value
+        slices for steps 0..keep-1
+    """
+    n_start = n_steps - 1 if smoothing is not None else n_steps
+    j = np.arange(n_start + 1)
+    S = S0 * np.exp((n_start - j) * np.log(u) + j * np.log(d))
+    V = np.maximum(0, sign * (S - K))
+    if smoothing is not None:
+        r, dt, sigma = smoothing
+        V_bs = _black_scholes_price(S, K, dt, r, sigma, sign)
+        V = np.maximum(V, V_bs) if american else V_bs
+    pu = disc * p
+    pd = disc * (1 - p)
+    kept = [V] if n_start < keep else []
+    for i in range(n_start - 1, -1, -1):
+        V = pu * V[..., :-1] + pd * V[..., 1:]
+        if american:
+            S = S[..., :-1] / u
+            np.maximum(V, sign * (S - K), out=V)
+        if i < keep:
+            kept.append(V)
+    if keep:
+        return kept[::-1]
+    return np.atleast_2d(V)[:, 0]
+
+
+def lattice_parameters(S0, K, T, r, sigma, n_steps: int, scheme: str = "crr"):
+    """
+    Up/down factors and risk-neutral probability of a binomial lattice.
+
+    S0, K, T, r and sigma may be scalars or columns of shape (m, 1).
+    The 'crr' and 'bbs' schemes share the Cox-Ross-Rubinstein parameters.
+
+    Returns:
+        (u, d, p)
+    """
+    if scheme == "lr":
+        return leisen_reimer_parameters(S0, K, T, r, sigma, n_steps)
+    dt = T / n_steps
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1 / u
+    p = (np.exp(r * dt) - d) / (u - d)
+    return u, d, p
+
+
+def path_deltas(delta_tree: np.ndarray, path: Sequence[str]) -> List[float]:
+    """
+    Read the deltas along a path of 'u'/'d' moves off a node-wise delta tree.
+
+    Args:
+        delta_tree: Array indexed [down moves, time step], as returned by BinomialTree.delta_tree
+        path: Sequence of 'u' (up) or 'd' (down) moves starting at the root
+
+    Returns:
+        Deltas at the root and after each move (len(path) + 1 values)
+    """
+    moves = np.asarray(list(path), dtype=str)
+    if not np.isin(moves, ("u", "d")).all():
+        raise ValueError("Path must be a sequence of 'u' and 'd' only")
+    if len(moves) >= delta_tree.shape[1]:
+        raise ValueError("Path is longer than the tree")
+    downs = np.concatenate(([0], np.cumsum(moves == "d")))
+    return delta_tree[downs, np.arange(len(moves) + 1)].tolist()
+
 
 class BinomialTree:
-    def __init__(self, S0: float, K: float, T: float, r: float, sigma: float, n_steps: int):
+    SCHEMES = ("crr", "lr", "bbs")
+
+    def __init__(self, S0: float, K: float, T: float, r: float, sigma: float, n_steps: int,
+                 scheme: str = "crr"):
         """
         Initialize binomial tree model for option pricing.
+
+        Args:
+            scheme: Lattice parameters to use:
+                'crr' - Cox-Ross-Rubinstein (default)
+                'lr'  - Leisen-Reimer, centred on the strike; an even n_steps is raised by one
+                'bbs' - CRR with Black-Scholes values at the last step before expiry (smoothed)
         """
+        scheme = scheme.lower()
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"scheme must be one of {self.SCHEMES}")
+        if scheme == "lr" and n_steps % 2 == 0:
+            n_steps += 1
+
         self.S0 = S0
         self.K = K
         self.T = T
         self.r = r
         self.sigma = sigma
         self.n_steps = n_steps
+        self.scheme = scheme
         self.dt = T / n_steps
 
         # Calculate up/down factors and probability
-        self.u = np.exp(sigma * np.sqrt(self.dt))
-        self.d = 1 / self.u
-        self.p = (np.exp(r * self.dt) - self.d) / (self.u - self.d)
+        self.u, self.d, self.p = lattice_parameters(S0, K, T, r, sigma, n_steps, scheme)
 
-        # Store tree structures
-        self.stock_tree = np.zeros((n_steps + 1, n_steps + 1))
-        self.avg_stock_tree = np.zeros((n_steps + 1, n_steps + 1))
-        self.option_tree = np.zeros((n_steps + 1, n_steps + 1))
-        self._build_stock_tree()
+        # Tree structures are built on first use
+        self._stock_tree = None
+        self._avg_stock_tree = None
+        self._option_tree = None
+        self._deferred_price = None
 
-    def _build_stock_tree(self):
+    @property
+    def stock_tree(self) -> np.ndarray:
         """
-        Builds the stock price evolution tree and computes running averages.
+        Stock price tree: stock_tree[j, i] = S0 * u^(i-j) * d^j for j <= i, built on first access.
         """
-        for i in range(self.n_steps + 1):
-            for j in range(i + 1):
-                self.stock_tree[j, i] = self.S0 * (self.u ** (i - j)) * (self.d ** j)
+        if self._stock_tree is None:
+            self._stock_tree = self._build_stock_tree()
+        return self._stock_tree
 
-        # Compute running average stock prices over time
-        for i in range(self.n_steps + 1):
-            for j in range(i + 1):
-                self.avg_stock_tree[j, i] = np.mean(self.stock_tree[: j + 1, i])
+    @property
+    def avg_stock_tree(self) -> np.ndarray:
+        """
+        Running averages of the stock price tree down each time step, built on first access.
+        """
+        if self._avg_stock_tree is None:
+            self._avg_stock_tree = self._build_avg_stock_tree()
+        return self._avg_stock_tree
+
+    @property
+    def option_tree(self) -> np.ndarray:
+        """
+        Option value tree filled by the last price_* call.
+        """
+        # A price served from the price cache fills the tree only when it is read
+        while self._deferred_price is not None:
+            deferred, self._deferred_price = self._deferred_price, None
+            deferred()
+        if self._option_tree is None:
+            self._option_tree = np.zeros((self.n_steps + 1, self.n_steps + 1))
+        return self._option_tree
 
-    def price_european(self, option_type: OptionType) -> float:
+    def _build_stock_tree(self) -> np.ndarray:
+        """
+        Builds the stock price evolution tree from broadcast powers of u and d.
+        """
+        j = np.arange(self.n_steps + 1)[:, None]  # number of down moves
+        i = np.arange(self.n_steps + 1)[None, :]  # time step
+        ups = np.maximum(i - j, 0)
+        return np.triu(self.S0 * np.exp(ups * np.log(self.u) + j * np.log(self.d)))
+
+    def _build_avg_stock_tree(self) -> np.ndarray:
+        """
+        Computes running average stock prices over time with cumulative sums.
+        """
+        counts = np.arange(1, self.n_steps + 2)[:, None]
+        return np.triu(np.cumsum(self.stock_tree, axis=0) / counts)
+
+    def _smoothing(self):
+        return (self.r, self.dt, self.sigma) if self.scheme == "bbs" else None
+
+    def _smooth_last_step(self, option_type: OptionType, american: bool) -> int:
+        """
+        For the 'bbs' scheme, fill the step before expiry with one-period Black-Scholes values.
+        Returns the last step that backward induction has to start from.
+        """
+        if self.scheme != "bbs":
+            return self.n_steps
+        n = self.n_steps - 1
+        stock = self.stock_tree[: n + 1, n]
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        values = _black_scholes_price(stock, self.K, self.dt, self.r, self.sigma, sign)
+        if american:
+            values = np.maximum(values, np.maximum(0, sign * (stock - self.K)))
+        self.option_tree[: n + 1, n] = values
+        return n
+
+    def _richardson(self, option_type: OptionType, option_style: OptionStyle) -> float:
+        """
+        Two-point Richardson extrapolation from trees with n_steps and about n_steps // 2 steps.
+        Errors are taken as O(1/n), except O(1/n^2) for European Leisen-Reimer prices.
+
+        Only the 'bbs' (BBSR) and 'lr' schemes converge smoothly enough for this; the error of a
+        CRR tree oscillates between odd and even step counts, and extrapolating it makes it worse.
+        """
+        if self.scheme == "crr":
+            raise ValueError("Richardson extrapolation needs scheme='bbs' or 'lr'; CRR prices oscillate in n_steps")
+        half = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma, max(self.n_steps // 2, 1), self.scheme)
+        if option_style == OptionStyle.EUROPEAN:
+            full_price, half_price = self.price_european(option_type), half.price_european(option_type)
+        else:
+            full_price, half_price = self.price_american(option_type), half.price_american(option_type)
+        order = 2 if self.scheme == "lr" and option_style == OptionStyle.EUROPEAN else 1
+        # Leisen-Reimer trees round even step counts up, so use the actual ratio of step counts
+        full_weight, half_weight = self.n_steps ** order, half.n_steps ** order
+        return (full_weight * full_price - half_weight * half_price) / (full_weight - half_weight)
+
+    @cached_price("n_steps", "scheme")
+    def price_european(self, option_type: OptionType, richardson: bool = False) -> float:
         """
         Compute European option price using backward induction.
+
+        Args:
+            richardson: Extrapolate from this tree and one with half the steps ('bbs' and 'lr' only)
         """
-        for j in range(self.n_steps + 1):
-            self.option_tree[j, self.n_steps] = max(0, (self.stock_tree[j, self.n_steps] - self.K) if option_type == OptionType.CALL else (self.K - self.stock_tree[j, self.n_steps]))
+        if richardson:
+            return self._richardson(option_type, OptionStyle.EUROPEAN)
 
-        for i in range(self.n_steps - 1, -1, -1):
-            for j in range(i + 1):
-                self.option_tree[j, i] = np.exp(-self.r * self.dt) * (self.p * self.option_tree[j, i + 1] + (1 - self.p) * self.option_tree[j + 1, i + 1])
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        stock, option = self.stock_tree, self.option_tree
+        disc = np.exp(-self.r * self.dt)
+        option[:, self.n_steps] = np.maximum(0, sign * (stock[:, self.n_steps] - self.K))
+
+        start = self._smooth_last_step(option_type, american=False)
+        for i in range(start - 1, -1, -1):
+            option[: i + 1, i] = disc * (self.p * option[: i + 1, i + 1] + (1 - self.p) * option[1: i + 2, i + 1])
 
-        return self.option_tree[0, 0]
+        return option[0, 0]
 
-    def price_american(self, option_type: OptionType) -> float:
+    @cached_price("n_steps", "scheme")
+    def price_american(self, option_type: OptionType, richardson: bool = False) -> float:
         """
         Compute American option price using backward induction.
+
+        Args:
+            richardson: Extrapolate from this tree and one with half the steps ('bbs' and 'lr' only)
         """
-        for j in range(self.n_steps + 1):
-            self.option_tree[j, self.n_steps] = max(0, (self.stock_tree[j, self.n_steps] - self.K) if option_type == OptionType.CALL else (self.K - self.stock_tree[j, self.n_steps]))
+        if richardson:
+            return self._richardson(option_type, OptionStyle.AMERICAN)
 
-        for i in range(self.n_steps - 1, -1, -1):
-            for j in range(i + 1):
-                hold_value = np.exp(-self.r * self.dt) * (self.p * self.option_tree[j, i + 1] + (1 - self.p) * self.option_tree[j + 1, i + 1])
-                intrinsic_value = max(0, (self.stock_tree[j, i] - self.K) if option_type == OptionType.CALL else (self.K - self.stock_tree[j, i]))
-                self.option_tree[j, i] = max(hold_value, intrinsic_value)
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        stock, option = self.stock_tree, self.option_tree
+        disc = np.exp(-self.r * self.dt)
+        option[:, self.n_steps] = np.maximum(0, sign * (stock[:, self.n_steps] - self.K))
+
+        start = self._smooth_last_step(option_type, american=True)
+        for i in range(start - 1, -1, -1):
+            hold_value = disc * (self.p * option[: i + 1, i + 1] + (1 - self.p) * option[1: i + 2, i + 1])
+            intrinsic_value = np.maximum(0, sign * (stock[: i + 1, i] - self.K))
+            option[: i + 1, i] = np.maximum(hold_value, intrinsic_value)
 
-        return self.option_tree[0, 0]
+        return option[0, 0]
 
+    @cached_price("n_steps", "scheme")
     def price_asian(self, option_type: OptionType = OptionType.PUT) -> float:
         """
         Price an Asian option using a binomial tree.
@@ -78,37 +263,146 @@ class BinomialTree:
         Returns:
             Asian option price
         """
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        option = self.option_tree
+        disc = np.exp(-self.r * self.dt)
+
         # Compute terminal payoffs based on the average stock price at each node
-        for j in range(self.n_steps + 1):
-            avg_price = np.mean(self.stock_tree[j, :])  # Correctly compute path-dependent avg
-            if option_type == OptionType.CALL:
-                self.option_tree[j, self.n_steps] = max(0, avg_price - self.K)
-            else:
-                self.option_tree[j, self.n_steps] = max(0, self.K - avg_price)
-
-        # Backward induction for pricing
+        avg_price = self.stock_tree.mean(axis=1)
+        option[:, self.n_steps] = np.maximum(0, sign * (avg_price - self.K))
+
+        # Backward induction for pricing (no early exercise, so purely expectation-based)
         for i in range(self.n_steps - 1, -1, -1):
-            for j in range(i + 1):
-                # Compute expected discounted value
-                expected_value = np.exp(-self.r * self.dt) * (
-                        self.p * self.option_tree[j, i + 1] + (1 - self.p) * self.option_tree[j + 1, i + 1]
-                )
-                avg_price = np.mean(self.stock_tree[j, : i + 1])  # Average price up to this node
-                intrinsic_value = max(0, self.K - avg_price) if option_type == OptionType.PUT else max(0, avg_price - self.K) #noqa
+            option[: i + 1, i] = disc * (self.p * option[: i + 1, i + 1] + (1 - self.p) * option[1: i + 2, i + 1])
+
+        return option[0, 0]
+
+    def price_chain(self, strikes: Sequence[float],
+                    option_types: Union[OptionType, Sequence[OptionType]] = OptionType.CALL,
+                    option_style: OptionStyle = OptionStyle.EUROPEAN) -> np.ndarray:
+        """
+        Price a whole option chain in one backward pass over a (strikes x nodes) array.
+
+        Args:
+            strikes: Strike prices (the tree's own K is ignored)
+            option_types: One OptionType for all strikes, or one per strike
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN
+
+        Returns:
+            Option prices aligned with strikes
+        """
+        if option_style not in (OptionStyle.EUROPEAN, OptionStyle.AMERICAN):
+            raise ValueError("price_chain supports only European and American options")
+        K = np.asarray(strikes, dtype=float).reshape(-1, 1)
+        sign = _payoff_signs(option_types, K.shape[0])
+        # Leisen-Reimer factors are centred on the strike, so each strike gets its own
+        u, d, p = lattice_parameters(self.S0, K, self.T, self.r, self.sigma, self.n_steps, self.scheme)
+        return _rollback(self.S0, u, d, p, np.exp(-self.r * self.dt), K, sign,
+                         self.n_steps, option_style == OptionStyle.AMERICAN, smoothing=self._smoothing())
+
+    def greeks(self, option_type: OptionType, option_style: OptionStyle = OptionStyle.EUROPEAN,
+               vega_rho: bool = True, dv: float = 0.01, dr: float = 0.0001) -> dict:
+        """
+        Compute price, delta, gamma and theta from a single extended lattice.
 
-                # Store the max value (since early exercise is not allowed, it's purely expectation-based)
-                self.option_tree[j, i] = expected_value
+        The lattice is started two steps before t=0, so the three nodes of its
+        second step are the stock prices S0*u/d, S0 and S0*d/u at t=0. Delta and
+        gamma follow from those nodes and theta from the change between the root
+        and the middle node, all in one backward induction.
 
-        return self.option_tree[0, 0]
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN
+            vega_rho: Also compute vega (one lattice with sigma + dv) and rho
+                (the same lattice nodes rolled back with r + dr)
+            dv: Volatility bump for vega
+            dr: Interest rate bump for rho
+
+        Returns:
+            Dictionary with price, delta, gamma, theta and, if requested, vega and rho
+        """
+        if option_style not in (OptionStyle.EUROPEAN, OptionStyle.AMERICAN):
+            raise ValueError("greeks supports only European and American options")
+        american = option_style == OptionStyle.AMERICAN
+        sign = _payoff_signs(option_type, 1)[0, 0]
+        disc = np.exp(-self.r * self.dt)
+
+        # Extended lattice: n_steps + 2 steps of size dt, rooted at t = -2*dt so that
+        # the middle node of step 2 is S0 (the root is S0 itself when u * d = 1)
+        root = self.S0 / (self.u * self.d)
+        V0, _, V2 = _rollback(root, self.u, self.d, self.p, disc, self.K, sign,
+                              self.n_steps + 2, american, keep=3, smoothing=self._smoothing())
+        S_uu, S_dd = self.S0 * self.u / self.d, self.S0 * self.d / self.u
+        V_uu, V_mid, V_dd = V2
+        delta_up = (V_uu - V_mid) / (S_uu - self.S0)
+        delta_down = (V_mid - V_dd) / (self.S0 - S_dd)
+        delta = (V_uu - V_dd) / (S_uu - S_dd)
+        gamma = (delta_up - delta_down) / (0.5 * (S_uu - S_dd))
+        # Move the root value to spot S0 before differencing in time (no-op when u * d = 1)
+        shift = root - self.S0
+        V_root = V0[0] - delta * shift - 0.5 * gamma * shift ** 2
+        result = {
+            "price": V_mid,
+            "delta": delta,
+            "gamma": gamma,
+            "theta": (V_mid - V_root) / (2 * self.dt),
+        }
+
+        if vega_rho:
+            bumped = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma + dv, self.n_steps, self.scheme)
+            price_vol = _rollback(self.S0, bumped.u, bumped.d, bumped.p, disc, self.K, sign,
+                                  self.n_steps, american, smoothing=bumped._smoothing())[0]
+            # Rho reuses this lattice's nodes, rolled back with the r-bumped probability and discount
+            p_rate = (np.exp((self.r + dr) * self.dt) - self.d) / (self.u - self.d)
+            smoothing = (self.r + dr, self.dt, self.sigma) if self.scheme == "bbs" else None
+            price_rate = _rollback(self.S0, self.u, self.d, p_rate, np.exp(-(self.r + dr) * self.dt),
+                                   self.K, sign, self.n_steps, american, smoothing=smoothing)[0]
+            result["vega"] = (price_vol - V_mid) / dv
+            result["rho"] = (price_rate - V_mid) / dr
+
+        return result
 
     def delta(self, option_type: OptionType) -> float:
         """
-        Compute Delta using finite difference method.
+        Compute Delta from the extended lattice (see greeks).
+        """
+        return self.greeks(option_type, vega_rho=False)["delta"]
+
+    def delta_tree(self, option_type: OptionType, option_style: OptionStyle = OptionStyle.EUROPEAN) -> np.ndarray:
+        """
+        Node-wise hedge ratios from a single lattice.
+
+        delta_tree[j, i] = (V_up - V_down) / (S_up - S_down) over the two successors of node (j, i).
+        The last column (expiry) is zero, since no hedge is held there.
+
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN
+
+        Returns:
+            Array of shape (n_steps + 1, n_steps + 1) indexed like stock_tree
+        """
+        # Bypass the price cache: the option tree has to be filled
+        self._deferred_price = None
+        if option_style == OptionStyle.EUROPEAN:
+            BinomialTree.price_european.__wrapped__(self, option_type)
+        elif option_style == OptionStyle.AMERICAN:
+            BinomialTree.price_american.__wrapped__(self, option_type)
+        else:
+            raise ValueError("delta_tree supports only European and American options")
+
+        stock, option = self.stock_tree, self.option_tree
+        deltas = np.zeros_like(stock)
+        nodes = np.triu(np.ones((self.n_steps, self.n_steps), dtype=bool))
+        np.divide(option[:-1, 1:] - option[1:, 1:], stock[:-1, 1:] - stock[1:, 1:], out=deltas[:-1, :-1], where=nodes)
+        return deltas
+
+    def path_deltas(self, path: Sequence[str], option_type: OptionType,
+                    option_style: OptionStyle = OptionStyle.EUROPEAN) -> List[float]:
+        """
+        Deltas along a path of 'u'/'d' moves, from one lattice (see delta_tree).
         """
-        h = self.S0 * 0.01  # Small change in stock price
-        option_up = BinomialTree(self.S0 + h, self.K, self.T, self.r, self.sigma, self.n_steps).price_european(option_type)
-        option_down = BinomialTree(self.S0 - h, self.K, self.T, self.r, self.sigma, self.n_steps).price_european(option_type)
-        return (option_up - option_down) / (2 * h)
+        return path_deltas(self.delta_tree(option_type, option_style), path)
 
     def delta_steps(self, option_type: OptionType) -> float:
         """
@@ -134,7 +428,7 @@ class BinomialTree:
         Compute Vega using finite difference method.
         """
         option_original = self.price_european(option_type)
-        option_higher_vol = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma + dv, self.n_steps).price_european(option_type)
+        option_higher_vol = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma + dv, self.n_steps, self.scheme).price_european(option_type)
         return (option_higher_vol - option_original) / dv
 
     def get_trees(self) -> Tuple[np.ndarray, np.ndarray]:
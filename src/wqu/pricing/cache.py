@@ -0,0 +1,153 @@
+# src/wqu/pricing/cache.py
+import functools
+import inspect
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class PriceCache:
+    def __init__(self, maxsize: int = 1024, decimals: int = 10):
+        """
+        Least-recently-used cache of option prices per unit of S0.
+
+        Lattice and finite-difference prices are homogeneous of degree one in (S0, K),
+        so price(S0, K) = S0 * price(1, K / S0). Entries are keyed on the moneyness K / S0
+        and the other parameters rounded to a fixed number of decimals, which lets the same
+        contract on another underlying, or at another spot with the same moneyness, reuse a price.
+
+        Args:
+            maxsize: Maximum number of cached prices
+            decimals: Decimals the parameters are rounded to in the keys
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, *parts: Hashable, S0: float, K: float, T: float, r: float, sigma: float) -> tuple:
+        """
+        Cache key of a pricing call: the given parts plus the rounded K / S0, T, r and sigma.
+        """
+        d = self.decimals
+        return parts + (round(K / S0, d), round(T, d), round(r, d), round(sigma, d))
+
+    def lookup(self, key: Hashable, S0: float, compute: Callable[[], float]) -> float:
+        """
+        Price for spot S0 from the cache, or from compute() on a miss.
+        """
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return S0 * entries[key]
+        self.misses += 1
+        price = compute()
+        entries[key] = price / S0
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return price
+
+    def stats(self) -> dict:
+        """
+        Hit/miss statistics of the cache.
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """
+        Drop all entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_active_cache: Optional[PriceCache] = None
+
+
+def enable_price_cache(maxsize: int = 1024, decimals: int = 10) -> PriceCache:
+    """
+    Start caching the prices of the binomial, trinomial and finite-difference pricers,
+    and so of Option.price for those methods.
+
+    Returns:
+        The new active PriceCache, e.g. to read its stats()
+    """
+    global _active_cache
+    _active_cache = PriceCache(maxsize, decimals)
+    return _active_cache
+
+
+def disable_price_cache():
+    """
+    Stop caching prices and drop the active cache.
+    """
+    global _active_cache
+    _active_cache = None
+
+
+def get_price_cache() -> Optional[PriceCache]:
+    """
+    The active PriceCache, or None if caching is disabled.
+    """
+    return _active_cache
+
+
+def cached_price(*settings: str):
+    """
+    Decorate a pricer's price_* method to use the active PriceCache, if any.
+
+    The pricer must have S0, K, T, r and sigma attributes; settings names further attributes
+    that change the price (step counts, schemes, grid settings) and become part of the key.
+    On a cache hit the method is not run; the call is kept as self._deferred_price instead,
+    so that readers of state it would have filled (e.g. BinomialTree.option_tree) can run it.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        defaults = tuple(p.default for p in list(signature.parameters.values())[1:])
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = _active_cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            if kwargs:
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                args = bound.args[1:]
+                kwargs = {}
+            else:
+                args = args + defaults[len(args):]
+            key = cache.key(
+                type(self).__name__, method.__name__, *args,
+                *(getattr(self, name) for name in settings),
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma,
+            )
+            computed = False
+
+            def compute():
+                nonlocal computed
+                computed = True
+                self._deferred_price = None
+                return method(self, *args, **kwargs)
+
+            price = cache.lookup(key, self.S0, compute)
+            if not computed:
+                self._deferred_price = functools.partial(method, self, *args, **kwargs)
+            return price
+
+        return wrapper
+    return decorator
@@ -1,5 +1,9 @@
 # src/wqu/pricing/greeks.py
-from typing import Callable
+import functools
+import inspect
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Sequence
 
 def compute_vega(pricing_func: Callable, sigma: float, 
                 delta_vol: float = 0.05, **kwargs) -> float:
@@ -53,3 +57,111 @@ def compute_delta(pricing_func: Callable, S0: float,
     delta = (price_up - price_down)/(2 * delta_S)
     
     return round(delta, 4)
+
+GREEKS = ("delta", "gamma", "vega", "theta", "rho", "vanna", "volga")
+
+# Evaluation points of each Greek as offsets (S0, sigma, T, r) in units of the bump sizes
+_STENCILS = {
+    "price": [(0, 0, 0, 0)],
+    "delta": [(1, 0, 0, 0), (-1, 0, 0, 0)],
+    "gamma": [(1, 0, 0, 0), (0, 0, 0, 0), (-1, 0, 0, 0)],
+    "vega": [(0, 1, 0, 0), (0, -1, 0, 0)],
+    "theta": [(0, 0, -1, 0), (0, 0, 0, 0)],
+    "rho": [(0, 0, 0, 1), (0, 0, 0, -1)],
+    "vanna": [(1, 1, 0, 0), (1, -1, 0, 0), (-1, 1, 0, 0), (-1, -1, 0, 0)],
+    "volga": [(0, 1, 0, 0), (0, 0, 0, 0), (0, -1, 0, 0)],
+}
+
+def _evaluate(pricing_func: Callable, params: dict) -> float:
+    """Call the pricer; results with a price attribute (e.g. MonteCarloResult) give that price"""
+    value = pricing_func(**params)
+    return float(getattr(value, "price", value))
+
+def _accepts_seed(pricing_func: Callable) -> bool:
+    try:
+        return "seed" in inspect.signature(pricing_func).parameters
+    except (TypeError, ValueError):
+        return False
+
+def compute_greeks(pricing_func: Callable, S0: float, sigma: float, T: Optional[float] = None,
+                   r: Optional[float] = None, greeks: Sequence[str] = GREEKS, dS: Optional[float] = None,
+                   dv: float = 0.01, dT: float = 1 / 365, dr: float = 0.0001, parallel: Optional[str] = None,
+                   max_workers: Optional[int] = None, seed: Optional[int] = None, **kwargs) -> Dict[str, float]:
+    """
+    Compute several Greeks by bump-and-revalue with as few pricer calls as possible.
+
+    The evaluation points of all requested Greeks (central differences, plus a forward step
+    in calendar time for theta) are pooled so that every distinct point is priced once;
+    e.g. delta, gamma, vega and volga together need 5 calls. The pricer is called with keyword
+    arguments S0 and sigma, T and r if given, and **kwargs.
+
+    Pricers that take a seed argument (Monte Carlo pricers) are called with the same seed
+    at every point, so all bumped prices use common random numbers.
+
+    Args:
+        pricing_func: Option pricing function returning a price or an object with a price attribute
+        S0: Current stock price
+        sigma: Current volatility
+        T: Time to expiration in years (needed for theta)
+        r: Risk-free interest rate (needed for rho)
+        greeks: Greeks to compute, any of 'delta', 'gamma', 'vega', 'theta', 'rho', 'vanna', 'volga'
+        dS: Stock price bump (default 1% of S0)
+        dv: Volatility bump
+        dT: Time bump for theta
+        dr: Interest rate bump
+        parallel: None (serial), 'thread' or 'process'; a process pool needs a picklable pricer
+        max_workers: Pool size
+        seed: Seed passed to pricers that take one (random if not given)
+        **kwargs: Additional arguments for pricing function
+
+    Returns:
+        Dictionary with the price and the requested Greeks (theta per year, unrounded)
+    """
+    unknown = set(greeks) - set(GREEKS)
+    if unknown:
+        raise ValueError(f"Unknown Greeks {sorted(unknown)}; choose from {GREEKS}")
+    if "theta" in greeks and T is None:
+        raise ValueError("theta needs T")
+    if "rho" in greeks and r is None:
+        raise ValueError("rho needs r")
+    if parallel not in (None, "thread", "process"):
+        raise ValueError("parallel must be None, 'thread' or 'process'")
+    if dS is None:
+        dS = S0 * 0.01
+
+    params = dict(kwargs)
+    if _accepts_seed(pricing_func):
+        params["seed"] = seed if seed is not None else int(np.random.default_rng().integers(2 ** 32))
+
+    points = list(dict.fromkeys(p for name in ("price", *greeks) for p in _STENCILS[name]))
+    calls = []
+    for i_S, i_v, i_T, i_r in points:
+        call = dict(params, S0=S0 + i_S * dS, sigma=sigma + i_v * dv)
+        if T is not None:
+            call["T"] = T + i_T * dT
+        if r is not None:
+            call["r"] = r + i_r * dr
+        calls.append(call)
+
+    evaluate = functools.partial(_evaluate, pricing_func)
+    if parallel is None:
+        values = [evaluate(call) for call in calls]
+    else:
+        pool = ThreadPoolExecutor if parallel == "thread" else ProcessPoolExecutor
+        with pool(max_workers=max_workers) as executor:
+            values = list(executor.map(evaluate, calls))
+    V = dict(zip(points, values))
+
+    result = {"price": V[(0, 0, 0, 0)]}
+    formulas = {
+        "delta": lambda: (V[(1, 0, 0, 0)] - V[(-1, 0, 0, 0)]) / (2 * dS),
+        "gamma": lambda: (V[(1, 0, 0, 0)] - 2 * V[(0, 0, 0, 0)] + V[(-1, 0, 0, 0)]) / dS ** 2,
+        "vega": lambda: (V[(0, 1, 0, 0)] - V[(0, -1, 0, 0)]) / (2 * dv),
+        "theta": lambda: (V[(0, 0, -1, 0)] - V[(0, 0, 0, 0)]) / dT,
+        "rho": lambda: (V[(0, 0, 0, 1)] - V[(0, 0, 0, -1)]) / (2 * dr),
+        "vanna": lambda: (V[(1, 1, 0, 0)] - V[(1, -1, 0, 0)] - V[(-1, 1, 0, 0)] + V[(-1, -1, 0, 0)]) / (4 * dS * dv),
+        "volga": lambda: (V[(0, 1, 0, 0)] - 2 * V[(0, 0, 0, 0)] + V[(0, -1, 0, 0)]) / dv ** 2,
+    }
+    for name in greeks:
+        result[name] = formulas[name]()
+    return result
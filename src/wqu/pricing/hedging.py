@@ -1,7 +1,11 @@
 # src/wqu/pricing/hedging.py
 import numpy as np
-from typing import List
+import pandas as pd
+from typing import List, Optional, Union
 from dataclasses import dataclass
+from wqu.pricing.binomial import BinomialTree, path_deltas
+from wqu.pricing.options import OptionType, OptionStyle
+from wqu.pricing.utils import _black_scholes_delta, _black_scholes_price
 
 @dataclass
 class HedgingPosition:
@@ -11,6 +15,84 @@ class HedgingPosition:
     shares_traded: float
     cash_account: float
 
+class HedgingLedger:
+    COLUMNS = ("time_step", "stock_price", "delta", "shares_traded", "cash_account")
+
+    def __init__(self, n_steps: int, capacity: int = 0):
+        """
+        Columnar record of delta hedging runs, one row per (path, time step).
+
+        Every column is a NumPy array of shape (paths, n_steps + 1), so a row costs 36 bytes
+        and ledger.column('delta')[path, step] indexes directly. Paths are appended in chunks;
+        storage grows geometrically, like a list.
+
+        Args:
+            n_steps: Number of hedging steps per path
+            capacity: Number of paths to allocate up front
+        """
+        self.n_steps = n_steps
+        self.n_paths = 0
+        self._columns = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        shape = (capacity, self.n_steps + 1)
+        columns = {"time_step": np.empty(shape, dtype=np.int32)}
+        columns.update({name: np.empty(shape) for name in self.COLUMNS[1:]})
+        for name, column in self._columns.items():
+            columns[name][: self.n_paths] = column[: self.n_paths]
+        self._columns = columns
+
+    def append(self, stock_price: np.ndarray, delta: np.ndarray, shares_traded: np.ndarray,
+               cash_account: np.ndarray):
+        """
+        Append a chunk of paths; every argument has shape (m, n_steps + 1).
+        """
+        chunk = np.atleast_2d(stock_price).shape[0]
+        capacity = self._columns["time_step"].shape[0]
+        if self.n_paths + chunk > capacity:
+            self._allocate(max(self.n_paths + chunk, 2 * capacity))
+        rows = slice(self.n_paths, self.n_paths + chunk)
+        self._columns["time_step"][rows] = np.arange(self.n_steps + 1)
+        for name, values in zip(self.COLUMNS[1:], (stock_price, delta, shares_traded, cash_account)):
+            self._columns[name][rows] = values
+        self.n_paths += chunk
+
+    def __len__(self) -> int:
+        return self.n_paths * (self.n_steps + 1)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        View of one column, shape (n_paths, n_steps + 1).
+        """
+        if name not in self.COLUMNS:
+            raise KeyError(f"Unknown column {name!r}; choose from {self.COLUMNS}")
+        return self._columns[name][: self.n_paths]
+
+    def __getitem__(self, key) -> HedgingPosition:
+        """
+        Row of one (path, time step) as a HedgingPosition.
+        """
+        path, step = key
+        return HedgingPosition(*(self.column(name)[path, step].item() for name in self.COLUMNS))
+
+    def positions(self, path: int = 0) -> List[HedgingPosition]:
+        """
+        Rows of one path as a list of HedgingPosition objects.
+        """
+        return [self[path, step] for step in range(self.n_steps + 1)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame view of the ledger with a (path, time_step) MultiIndex.
+
+        The columns share memory with the ledger, so no data is copied.
+        """
+        index = pd.MultiIndex.from_product([range(self.n_paths), range(self.n_steps + 1)],
+                                           names=["path", "step"])
+        data = {name: self.column(name).reshape(-1) for name in self.COLUMNS}
+        return pd.DataFrame(data, index=index, copy=False)
+
 class DeltaHedging:
     def __init__(self, S0: float, K: float, T: float, r: float, 
                  sigma: float, n_steps: int):
@@ -33,19 +115,25 @@ class DeltaHedging:
         self.n_steps = n_steps
         self.dt = T/n_steps
         
-    def simulate_path(self, path: List[str], option_price: float, 
-                     deltas: List[float]) -> List[HedgingPosition]:
+    def simulate_path(self, path: List[str], option_price: float,
+                     deltas: Union[List[float], np.ndarray],
+                     as_ledger: bool = False) -> Union[List[HedgingPosition], HedgingLedger]:
         """
         Simulate delta hedging along a specific path
         
         Args:
             path: List of 'u' (up) or 'd' (down) moves
             option_price: Initial option price
-            deltas: List of deltas at each node
+            deltas: List of deltas at each node along the path, or a whole
+                node-wise delta tree (e.g. Option.delta_tree()) to read them from
+            as_ledger: Return a one-path HedgingLedger instead of a list
             
         Returns:
-            List of HedgingPosition objects
+            List of HedgingPosition objects, or a HedgingLedger
         """
+        if isinstance(deltas, np.ndarray) and deltas.ndim == 2:
+            deltas = path_deltas(deltas, path[: deltas.shape[1] - 1])
+
         positions = []
         current_price = self.S0
         current_delta = deltas[0]
@@ -85,5 +173,103 @@ class DeltaHedging:
             ))
             
             current_delta = new_delta
-            
+
+        if as_ledger:
+            ledger = HedgingLedger(len(positions) - 1, capacity=1)
+            columns = [[getattr(position, name) for position in positions] for name in HedgingLedger.COLUMNS[1:]]
+            ledger.append(*columns)
+            return ledger
         return positions
+
+    def deltas(self, prices: np.ndarray, option_type: OptionType = OptionType.CALL,
+               delta_method: str = "black_scholes",
+               option_style: OptionStyle = OptionStyle.EUROPEAN,
+               steps: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Hedge ratios for an array of stock prices observed on the time steps of this model.
+
+        Args:
+            prices: Array of shape (M, k) with one price per path and time step
+            option_type: OptionType.CALL or OptionType.PUT
+            delta_method: 'black_scholes' (closed form at the remaining time to expiry) or
+                'lattice' (the CRR delta tree, read at the node nearest to each price)
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN (lattice deltas only)
+            steps: Time step (below n_steps) of each column of prices (default 0..k-1)
+
+        Returns:
+            Array of deltas with the shape of prices
+        """
+        prices = np.asarray(prices, dtype=float)
+        steps = np.arange(prices.shape[-1]) if steps is None else np.asarray(steps)
+        if delta_method == "black_scholes":
+            sign = 1.0 if option_type == OptionType.CALL else -1.0
+            return _black_scholes_delta(prices, self.K, self.T - steps * self.dt, self.r, self.sigma, sign)
+        elif delta_method == "lattice":
+            tree = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma, self.n_steps)
+            delta_tree = tree.delta_tree(option_type, option_style)
+            downs = np.rint((steps - np.log(prices / self.S0) / np.log(tree.u)) / 2)
+            downs = np.clip(downs, 0, steps).astype(int)
+            return delta_tree[downs, steps]
+        raise ValueError("delta_method must be 'black_scholes' or 'lattice'")
+
+    def backtest(self, prices: np.ndarray, option_type: OptionType = OptionType.CALL,
+                 option_price: Optional[float] = None, delta_method: str = "black_scholes",
+                 option_style: OptionStyle = OptionStyle.EUROPEAN, transaction_cost: float = 0.0,
+                 rebalance_every: int = 1, chunk_size: int = 10_000,
+                 ledger: Optional[HedgingLedger] = None) -> np.ndarray:
+        """
+        Backtest delta hedging of a sold option over many price paths at once.
+
+        The hedger receives option_price, buys delta shares and finances them through a cash
+        account earning r. The hedge is rebalanced every rebalance_every steps and unwound at
+        expiry, and every trade pays transaction_cost times its traded value. The P&L is the
+        final cash account minus the option payoff.
+
+        Args:
+            prices: Array of shape (M, n_steps + 1) of simulated or historical prices, one path per row
+            option_type: OptionType.CALL or OptionType.PUT
+            option_price: Premium received (default: the Black-Scholes or lattice price)
+            delta_method: 'black_scholes' or 'lattice' (see deltas)
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN (lattice deltas only)
+            transaction_cost: Proportional cost per unit of traded value
+            rebalance_every: Number of steps between rebalancing dates
+            chunk_size: Number of paths processed at a time
+            ledger: HedgingLedger to append the positions, trades and cash account of every path to
+
+        Returns:
+            P&L of each path, shape (M,)
+        """
+        prices = np.atleast_2d(np.asarray(prices, dtype=float))
+        if prices.shape[1] != self.n_steps + 1:
+            raise ValueError("prices must have n_steps + 1 columns")
+        if rebalance_every < 1:
+            raise ValueError("rebalance_every must be at least 1")
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        if option_price is None:
+            if delta_method == "lattice":
+                tree = BinomialTree(self.S0, self.K, self.T, self.r, self.sigma, self.n_steps)
+                option_price = (tree.price_european(option_type) if option_style == OptionStyle.EUROPEAN
+                                else tree.price_american(option_type))
+            else:
+                option_price = _black_scholes_price(self.S0, self.K, self.T, self.r, self.sigma, sign)
+
+        n = self.n_steps
+        rebalance_steps = np.arange(0, n, rebalance_every)
+        held = np.repeat(np.arange(rebalance_steps.size), rebalance_every)[:n]
+        growth = np.exp(self.r * self.dt * (n - np.arange(n + 1)))
+
+        pnl = np.empty(prices.shape[0])
+        for start in range(0, prices.shape[0], chunk_size):
+            S = prices[start: start + chunk_size]
+            position = np.zeros_like(S)
+            deltas = self.deltas(S[:, rebalance_steps], option_type, delta_method, option_style, rebalance_steps)
+            position[:, :n] = deltas[:, held]
+            trades = np.diff(position, axis=1, prepend=0.0)
+            cash_flows = trades * S + transaction_cost * np.abs(trades) * S
+            payoff = np.maximum(0, sign * (S[:, -1] - self.K))
+            pnl[start: start + chunk_size] = option_price * growth[0] - cash_flows @ growth - payoff
+            if ledger is not None:
+                # cash_i = cash_(i-1) * exp(r dt) - flow_i, from the premium at step 0
+                cash = (option_price * growth[0] - np.cumsum(cash_flows * growth, axis=1)) / growth
+                ledger.append(S, position, trades, cash)
+        return pnl
@@ -0,0 +1,231 @@
+# src/wqu/pricing/montecarlo.py
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+from scipy.special import ndtr, ndtri
+from wqu.pricing.options import OptionType
+from wqu.pricing.utils import _black_scholes_price
+
+
+@dataclass
+class MonteCarloResult:
+    price: float  # Estimated option price
+    std_error: float  # Standard error of the estimate
+    conf_int: Tuple[float, float]  # Confidence interval for the price
+    n_paths: int  # Number of simulated paths (rounded up to an even number with antithetic sampling)
+
+
+class MonteCarloEngine:
+    def __init__(self, S0: float, K: float, T: float, r: float, sigma: float, n_steps: int = 50,
+                 n_paths: int = 100_000, antithetic: bool = True, control_variate: bool = True,
+                 chunk_size: int = 50_000, seed: Optional[int] = None, confidence: float = 0.95,
+                 basis_degree: int = 3):
+        """
+        Vectorized Monte Carlo pricer under geometric Brownian motion.
+
+        European and Asian prices are accumulated over chunks of chunk_size paths, so memory
+        does not grow with n_paths. American prices use the Longstaff-Schwartz regression,
+        which needs all paths at once.
+
+        Args:
+            S0: Initial stock price
+            K: Strike price
+            T: Time to expiration in years
+            r: Risk-free interest rate (annual)
+            sigma: Volatility
+            n_steps: Number of monitoring (Asian) or exercise (American) dates
+            n_paths: Number of simulated paths
+            antithetic: Pair every normal draw Z with -Z
+            control_variate: Use a control with known mean: the discounted terminal price for
+                European options, the geometric-average option for Asian options and the
+                European option for American options
+            chunk_size: Number of paths simulated at a time
+            seed: Seed for numpy's random Generator (optional)
+            confidence: Confidence level of the reported interval
+            basis_degree: Degree of the polynomial regression basis for American options
+        """
+        if n_paths < 2:
+            raise ValueError("n_paths must be at least 2")
+        self.S0 = S0
+        self.K = K
+        self.T = T
+        self.r = r
+        self.sigma = sigma
+        self.n_steps = n_steps
+        self.n_paths = n_paths
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.confidence = confidence
+        self.basis_degree = basis_degree
+        self.dt = T / n_steps
+
+    def _normals(self, rng: np.random.Generator, n: int, dim: int) -> np.ndarray:
+        """
+        n rows of dim standard normals; with antithetic sampling the second half mirrors the first
+        """
+        if not self.antithetic:
+            return rng.standard_normal((n, dim))
+        Z = rng.standard_normal((n // 2, dim))
+        return np.concatenate((Z, -Z))
+
+    def _pair(self, x: np.ndarray) -> np.ndarray:
+        """
+        Average antithetic pairs into independent samples
+        """
+        if not self.antithetic:
+            return x
+        half = x.shape[0] // 2
+        return 0.5 * (x[:half] + x[half:])
+
+    def _chunks(self) -> Iterator[int]:
+        # Antithetic pairs need even chunks, so at most the last chunk is rounded up by one path
+        size = self.chunk_size + (self.chunk_size % 2 if self.antithetic else 0)
+        remaining = self.n_paths
+        while remaining > 0:
+            n = min(size, remaining)
+            if self.antithetic and n % 2:
+                n += 1
+            yield n
+            remaining -= n
+
+    def _result(self, sums: np.ndarray, control_mean: Optional[float]) -> MonteCarloResult:
+        """
+        Build the estimate from running sums [count, sum Y, sum Y^2, sum X, sum X^2, sum XY]
+        of the (paired) samples Y and controls X
+        """
+        n, s_y, s_yy, s_x, s_xx, s_xy = sums
+        mean_y = s_y / n
+        var_y = (s_yy - n * mean_y ** 2) / (n - 1)
+        price, variance = mean_y, var_y
+        if control_mean is not None:
+            mean_x = s_x / n
+            var_x = (s_xx - n * mean_x ** 2) / (n - 1)
+            cov_xy = (s_xy - n * mean_x * mean_y) / (n - 1)
+            if var_x > 0:
+                beta = cov_xy / var_x
+                price = mean_y - beta * (mean_x - control_mean)
+                variance = var_y - beta * cov_xy
+        std_error = np.sqrt(max(variance, 0.0) / n)
+        z = ndtri(0.5 + self.confidence / 2)
+        return MonteCarloResult(
+            price=float(price),
+            std_error=float(std_error),
+            conf_int=(float(price - z * std_error), float(price + z * std_error)),
+            n_paths=int(n) * (2 if self.antithetic else 1),
+        )
+
+    @staticmethod
+    def _accumulate(sums: np.ndarray, y: np.ndarray, x: np.ndarray):
+        sums += (y.size, y.sum(), y @ y, x.sum(), x @ x, x @ y)
+
+    def _simulate(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        Prices S_1..S_n_steps for n paths, shape (n, n_steps)
+        """
+        Z = self._normals(rng, n, self.n_steps)
+        increments = (self.r - 0.5 * self.sigma ** 2) * self.dt + self.sigma * np.sqrt(self.dt) * Z
+        return self.S0 * np.exp(np.cumsum(increments, axis=1))
+
+    def price_european(self, option_type: OptionType = OptionType.CALL) -> MonteCarloResult:
+        """
+        Price European option by sampling terminal prices only.
+
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+
+        Returns:
+            MonteCarloResult
+        """
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        rng = np.random.default_rng(self.seed)
+        disc = np.exp(-self.r * self.T)
+        sums = np.zeros(6)
+        for n in self._chunks():
+            Z = self._normals(rng, n, 1)[:, 0]
+            ST = self.S0 * np.exp((self.r - 0.5 * self.sigma ** 2) * self.T + self.sigma * np.sqrt(self.T) * Z)
+            y = self._pair(disc * np.maximum(0, sign * (ST - self.K)))
+            self._accumulate(sums, y, self._pair(disc * ST))
+        return self._result(sums, self.S0 if self.control_variate else None)
+
+    def _geometric_asian_price(self, sign: float) -> float:
+        """
+        Closed-form price of the geometric-average option on the same monitoring dates
+        """
+        n = self.n_steps
+        mu = np.log(self.S0) + (self.r - 0.5 * self.sigma ** 2) * self.T * (n + 1) / (2 * n)
+        vol = self.sigma * np.sqrt(self.T * (n + 1) * (2 * n + 1) / (6 * n ** 2))
+        d1 = (mu - np.log(self.K) + vol ** 2) / vol
+        d2 = d1 - vol
+        forward = np.exp(mu + 0.5 * vol ** 2)
+        return float(np.exp(-self.r * self.T) * sign * (forward * ndtr(sign * d1) - self.K * ndtr(sign * d2)))
+
+    def price_asian(self, option_type: OptionType = OptionType.CALL) -> MonteCarloResult:
+        """
+        Price arithmetic-average Asian option, averaging S_1..S_n_steps.
+
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+
+        Returns:
+            MonteCarloResult
+        """
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        rng = np.random.default_rng(self.seed)
+        disc = np.exp(-self.r * self.T)
+        sums = np.zeros(6)
+        for n in self._chunks():
+            paths = self._simulate(rng, n)
+            arithmetic = paths.mean(axis=1)
+            geometric = np.exp(np.log(paths).mean(axis=1))
+            y = self._pair(disc * np.maximum(0, sign * (arithmetic - self.K)))
+            x = self._pair(disc * np.maximum(0, sign * (geometric - self.K)))
+            self._accumulate(sums, y, x)
+        return self._result(sums, self._geometric_asian_price(sign) if self.control_variate else None)
+
+    def price_american(self, option_type: OptionType = OptionType.PUT) -> MonteCarloResult:
+        """
+        Price American option with the Longstaff-Schwartz least-squares method.
+
+        Exercise is possible at each of the n_steps dates. The continuation value of in-the-money
+        paths is regressed on a polynomial in S/K of degree basis_degree.
+
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+
+        Returns:
+            MonteCarloResult
+        """
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        rng = np.random.default_rng(self.seed)
+        n = self.n_paths + (self.n_paths % 2 if self.antithetic else 0)
+        paths = self._simulate(rng, n)
+        disc = np.exp(-self.r * self.dt)
+
+        # Cash flows of the current exercise policy, discounted to the date being processed
+        cash_flow = np.maximum(0, sign * (paths[:, -1] - self.K))
+        european = np.exp(-self.r * self.T) * cash_flow
+        for t in range(self.n_steps - 2, -1, -1):
+            cash_flow *= disc
+            exercise = np.maximum(0, sign * (paths[:, t] - self.K))
+            itm = exercise > 0
+            if itm.sum() > self.basis_degree + 1:
+                basis = np.vander(paths[itm, t] / self.K, self.basis_degree + 1)
+                coef, *_ = np.linalg.lstsq(basis, cash_flow[itm], rcond=None)
+                continuation = basis @ coef
+                exercised = np.flatnonzero(itm)[exercise[itm] > continuation]
+                cash_flow[exercised] = exercise[exercised]
+        y = disc * cash_flow
+
+        sums = np.zeros(6)
+        self._accumulate(sums, self._pair(y), self._pair(european))
+        bs = _black_scholes_price(self.S0, self.K, self.T, self.r, self.sigma, sign)
+        result = self._result(sums, bs if self.control_variate else None)
+
+        # Exercising immediately is always possible
+        intrinsic = max(0.0, sign * (self.S0 - self.K))
+        if intrinsic > result.price:
+            return MonteCarloResult(price=intrinsic, std_error=0.0, conf_int=(intrinsic, intrinsic),
+                                    n_paths=result.n_paths)
+        return result
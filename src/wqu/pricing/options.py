@@ -1,7 +1,8 @@
 # src/wqu/pricing/options.py
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Sequence, Union
+import numpy as np
 
 class OptionType(Enum):
     CALL = auto()
@@ -16,6 +17,15 @@ class PricingMethod(Enum):
     BINOMIAL = auto()
     TRINOMIAL = auto()
     MONTE_CARLO = auto()
+    FINITE_DIFFERENCE = auto()
+
+def _payoff_signs(option_types: Union[OptionType, Sequence[OptionType]], size: int) -> np.ndarray:
+    """Map option types to payoff signs (+1 call, -1 put) as a column of shape (size, 1)"""
+    if isinstance(option_types, OptionType):
+        option_types = [option_types] * size
+    if len(option_types) != size:
+        raise ValueError("option_types must be a single OptionType or one per strike")
+    return np.array([1.0 if t == OptionType.CALL else -1.0 for t in option_types]).reshape(-1, 1)
 
 @dataclass
 class Option:
@@ -29,6 +39,8 @@ class Option:
     option_style: OptionStyle = OptionStyle.EUROPEAN
     pricing_method: PricingMethod = PricingMethod.BINOMIAL
     n_steps: Optional[int] = None  # Number of steps for tree methods
+    lattice_scheme: str = "crr"  # Binomial lattice: 'crr', 'lr' (Leisen-Reimer) or 'bbs' (smoothed)
+    richardson: bool = False  # Richardson extrapolation for the binomial method ('bbs' or 'lr' lattices)
 
     def __post_init__(self):
         """Validate option parameters"""
@@ -42,6 +54,10 @@ class Option:
             raise ValueError("Volatility must be positive")
         if self.n_steps is not None and self.n_steps <= 0:
             raise ValueError("Number of steps must be positive")
+        if self.pricing_method != PricingMethod.BINOMIAL and (self.lattice_scheme != "crr" or self.richardson):
+            raise ValueError("lattice_scheme and richardson are only supported by the binomial method")
+        if self.richardson and self.lattice_scheme.lower() == "crr":
+            raise ValueError("richardson requires lattice_scheme='bbs' or 'lr'")
 
     def payoff(self, stock_price: float) -> float:
         """Calculate option payoff at expiration"""
@@ -51,54 +67,286 @@ class Option:
             return max(0, self.K - stock_price)
 
     def price(self) -> float:
-        """Calculate option price based on the selected pricing method"""
+        """
+        Calculate option price based on the selected pricing method.
+
+        With a price cache enabled (see wqu.pricing.cache.enable_price_cache), repeated lattice
+        and finite-difference prices are looked up instead of recomputed.
+        """
         from wqu.pricing.binomial import BinomialTree
         from wqu.pricing.trinomial import TrinomialTree
+        from wqu.pricing.finite_difference import FiniteDifference
 
         if self.n_steps is None:
             self.n_steps = 50
 
         if self.pricing_method == PricingMethod.BINOMIAL:
             tree = BinomialTree(
-                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps,
+                scheme=self.lattice_scheme
             )
-            return tree.price_european(self.option_type) if self.option_style == OptionStyle.EUROPEAN else tree.price_american(self.option_type)
+            return tree.price_european(self.option_type, self.richardson) if self.option_style == OptionStyle.EUROPEAN else tree.price_american(self.option_type, self.richardson)
         elif self.pricing_method == PricingMethod.TRINOMIAL:
             tree = TrinomialTree(
                 S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
             )
             return tree.price_european(self.option_type) if self.option_style == OptionStyle.EUROPEAN else tree.price_american(self.option_type)
         elif self.pricing_method == PricingMethod.MONTE_CARLO:
-            raise NotImplementedError("Monte Carlo pricing not implemented")
+            return self.monte_carlo().price
+        elif self.pricing_method == PricingMethod.FINITE_DIFFERENCE:
+            solver = FiniteDifference(
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
+            )
+            return solver.price_european(self.option_type) if self.option_style == OptionStyle.EUROPEAN else solver.price_american(self.option_type)
         else:
             raise ValueError("Invalid pricing method")
 
-    def deltas(self) -> List[float]:
-        """Calculate option deltas at each node"""
+    def monte_carlo(self, n_paths: int = 100_000, antithetic: bool = True, control_variate: bool = True,
+                    seed: Optional[int] = None, chunk_size: int = 50_000, confidence: float = 0.95):
+        """
+        Price the option by Monte Carlo simulation and report the sampling error.
+
+        European options sample terminal prices only; Asian options average the prices on the
+        n_steps monitoring dates; American options use Longstaff-Schwartz regression on
+        n_steps exercise dates.
+
+        Args:
+            n_paths: Number of simulated paths
+            antithetic: Use antithetic variates
+            control_variate: Use a control variate with a known price
+            seed: Seed for the random number generator (optional)
+            chunk_size: Number of paths simulated at a time
+            confidence: Confidence level of the reported interval
+
+        Returns:
+            MonteCarloResult with price, std_error, conf_int and n_paths
+        """
+        from wqu.pricing.montecarlo import MonteCarloEngine
+
+        if self.n_steps is None:
+            self.n_steps = 50
+
+        engine = MonteCarloEngine(
+            S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps,
+            n_paths=n_paths, antithetic=antithetic, control_variate=control_variate,
+            chunk_size=chunk_size, seed=seed, confidence=confidence
+        )
+        if self.option_style == OptionStyle.EUROPEAN:
+            return engine.price_european(self.option_type)
+        elif self.option_style == OptionStyle.ASIAN:
+            return engine.price_asian(self.option_type)
+        return engine.price_american(self.option_type)
+
+    def greeks(self) -> dict:
+        """Calculate price, delta, gamma, theta, vega and rho from the selected lattice or grid"""
+        from wqu.pricing.binomial import BinomialTree
+        from wqu.pricing.trinomial import TrinomialTree
+        from wqu.pricing.finite_difference import FiniteDifference
+
+        if self.n_steps is None:
+            self.n_steps = 50
+
+        if self.pricing_method == PricingMethod.BINOMIAL:
+            tree = BinomialTree(
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps,
+                scheme=self.lattice_scheme
+            )
+        elif self.pricing_method == PricingMethod.TRINOMIAL:
+            tree = TrinomialTree(
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
+            )
+        elif self.pricing_method == PricingMethod.FINITE_DIFFERENCE:
+            tree = FiniteDifference(
+                S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
+            )
+        else:
+            raise ValueError("Greeks are only available for tree and finite-difference pricing methods")
+        style = OptionStyle.EUROPEAN if self.option_style == OptionStyle.EUROPEAN else OptionStyle.AMERICAN
+        return tree.greeks(self.option_type, style)
+
+    def delta_tree(self) -> np.ndarray:
+        """
+        Node-wise deltas of the option on a CRR binomial lattice, indexed [down moves, time step].
+        The lattice moves by exp(+-sigma*sqrt(dt)), the same moves DeltaHedging assumes.
+        """
+        from wqu.pricing.binomial import BinomialTree
+
+        if self.n_steps is None:
+            self.n_steps = 50
+
+        tree = BinomialTree(
+            S0=self.S0, K=self.K, T=self.T, r=self.r, sigma=self.sigma, n_steps=self.n_steps
+        )
+        style = OptionStyle.EUROPEAN if self.option_style == OptionStyle.EUROPEAN else OptionStyle.AMERICAN
+        return tree.delta_tree(self.option_type, style)
+
+    def deltas(self, path: Optional[Sequence[str]] = None) -> Union[List[float], np.ndarray]:
+        """
+        Calculate option deltas along a path of the binomial lattice.
+
+        The lattice is built once (see delta_tree). For a full path the result has n_steps + 1
+        entries, ending with 0 at expiration. Without a path the whole delta tree is returned.
+        Either can be passed straight to DeltaHedging.simulate_path; pass the tree when hedging
+        along a path that is only known later.
+
+        Args:
+            path: Sequence of 'u'/'d' moves (optional)
+        """
+        from wqu.pricing.binomial import path_deltas
+
         if self.n_steps is None:
             self.n_steps = 50
+        if path is None:
+            return self.delta_tree()
+
+        return path_deltas(self.delta_tree(), path)
+
+def _enum_column(values, enum_cls, size: int) -> np.ndarray:
+    """Encode one enum member, or one per contract, as an integer column of enum values"""
+    if isinstance(values, enum_cls):
+        return np.full(size, values.value, dtype=np.int8)
+    codes = np.array([enum_cls(v).value for v in values], dtype=np.int8)
+    if codes.size != size:
+        raise ValueError(f"Expected a single {enum_cls.__name__} or one per contract")
+    return codes
+
+class OptionBook:
+    """
+    Columnar container of option contracts for batch pricing.
+
+    Contract fields are stored as NumPy arrays instead of one Option object per contract.
+    price() groups the contracts by pricing method, style, step count and lattice scheme and
+    prices each group with one vectorized backward induction over a (contracts x nodes) array.
+    Finite-difference and Monte Carlo contracts are priced one by one.
+    """
+    FIELDS = ("S0", "K", "T", "r", "sigma")
+
+    def __init__(self, S0, K, T, r, sigma,
+                 option_type: Union[OptionType, Sequence[OptionType]] = OptionType.CALL,
+                 option_style: Union[OptionStyle, Sequence[OptionStyle]] = OptionStyle.EUROPEAN,
+                 pricing_method: Union[PricingMethod, Sequence[PricingMethod]] = PricingMethod.BINOMIAL,
+                 n_steps: Union[int, Sequence[int]] = 50,
+                 lattice_scheme: Union[str, Sequence[str]] = "crr",
+                 chunk_size: int = 10_000):
+        """
+        Args:
+            S0, K, T, r, sigma: Contract parameters, scalars or arrays (broadcast to a common length)
+            option_type: One OptionType for all contracts, or one per contract
+            option_style: One OptionStyle for all contracts, or one per contract
+            pricing_method: One PricingMethod for all contracts, or one per contract
+            n_steps: Number of steps, for all contracts or per contract
+            lattice_scheme: Binomial lattice scheme ('crr', 'lr' or 'bbs'), for all contracts or per contract
+            chunk_size: Maximum number of contracts priced in one vectorized pass
+        """
+        columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (S0, K, T, r, sigma)))
+        self.S0, self.K, self.T, self.r, self.sigma = (c.copy() for c in columns)
+        size = self.S0.size
+
+        self.option_type = _enum_column(option_type, OptionType, size)
+        self.option_style = _enum_column(option_style, OptionStyle, size)
+        self.pricing_method = _enum_column(pricing_method, PricingMethod, size)
+        self.n_steps = np.broadcast_to(np.asarray(n_steps, dtype=np.int64), (size,)).copy()
+        self.lattice_scheme = np.broadcast_to(np.char.lower(np.asarray(lattice_scheme, dtype=str)), (size,)).copy()
+        self.chunk_size = chunk_size
+
+        if np.any(self.S0 <= 0):
+            raise ValueError("Initial stock price must be positive")
+        if np.any(self.K <= 0):
+            raise ValueError("Strike price must be positive")
+        if np.any(self.T <= 0):
+            raise ValueError("Time to expiration must be positive")
+        if np.any(self.sigma <= 0):
+            raise ValueError("Volatility must be positive")
+        if np.any(self.n_steps <= 0):
+            raise ValueError("Number of steps must be positive")
+        if not np.isin(self.lattice_scheme, ("crr", "lr", "bbs")).all():
+            raise ValueError("lattice_scheme must be one of ('crr', 'lr', 'bbs')")
+        if np.any((self.pricing_method != PricingMethod.BINOMIAL.value) & (self.lattice_scheme != "crr")):
+            raise ValueError("lattice_scheme is only supported by the binomial method")
+
+    @classmethod
+    def from_options(cls, options: Sequence[Option], chunk_size: int = 10_000) -> "OptionBook":
+        """
+        Build a book from Option objects; their n_steps default to 50 as in Option.price.
+        """
+        if any(o.richardson for o in options):
+            raise ValueError("OptionBook does not support Richardson extrapolation")
+        fields = {name: [getattr(o, name) for o in options] for name in cls.FIELDS}
+        return cls(
+            **fields,
+            option_type=[o.option_type for o in options],
+            option_style=[o.option_style for o in options],
+            pricing_method=[o.pricing_method for o in options],
+            n_steps=[50 if o.n_steps is None else o.n_steps for o in options],
+            lattice_scheme=[o.lattice_scheme for o in options],
+            chunk_size=chunk_size,
+        )
+
+    def __len__(self) -> int:
+        return self.S0.size
+
+    def __getitem__(self, i: int) -> Option:
+        """The i-th contract as an Option"""
+        return Option(
+            S0=float(self.S0[i]), K=float(self.K[i]), T=float(self.T[i]), r=float(self.r[i]),
+            sigma=float(self.sigma[i]), option_type=OptionType(int(self.option_type[i])),
+            option_style=OptionStyle(int(self.option_style[i])),
+            pricing_method=PricingMethod(int(self.pricing_method[i])),
+            n_steps=int(self.n_steps[i]), lattice_scheme=str(self.lattice_scheme[i]),
+        )
+
+    def groups(self) -> dict:
+        """
+        Contract indices grouped by (pricing method, option style, n_steps, lattice scheme).
+        """
+        schemes, scheme_codes = np.unique(self.lattice_scheme, return_inverse=True)
+        keys = np.column_stack((self.pricing_method, self.option_style, self.n_steps, scheme_codes.ravel()))
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(unique_keys)))[:-1]
+        return {
+            (PricingMethod(int(method)), OptionStyle(int(style)), int(n_steps), str(schemes[scheme])): index
+            for (method, style, n_steps, scheme), index in zip(unique_keys, np.split(order, bounds))
+        }
 
-        dt = self.T / self.n_steps
-        deltas = []
+    def price(self) -> np.ndarray:
+        """
+        Price every contract in the book.
 
-        for i in range(self.n_steps + 1):
-            t = i * dt
-            remaining_T = self.T - t
-            if remaining_T <= 0:
-                deltas.append(0.0)  # At expiration
-                continue
+        European contracts are priced as such; other styles get early exercise, as in Option.price
+        (except Monte Carlo, which prices Asian options as averages).
 
-            # Calculate delta using finite differences
-            h = self.S0 * 0.01
-            price_up = self.price()
+        Returns:
+            Prices aligned with the contracts of the book
+        """
+        prices = np.empty(len(self))
+        for (method, style, n_steps, scheme), index in self.groups().items():
+            for start in range(0, index.size, self.chunk_size):
+                rows = index[start: start + self.chunk_size]
+                prices[rows] = self._price_group(rows, method, style, n_steps, scheme)
+        return prices
 
-            # Temporarily modify S0 for down price
-            original_S0 = self.S0
-            self.S0 = self.S0 - h
-            price_down = self.price()
-            self.S0 = original_S0  # Restore original S0
+    def _price_group(self, rows: np.ndarray, method: PricingMethod, style: OptionStyle,
+                     n_steps: int, scheme: str) -> np.ndarray:
+        """
+        Price contracts that share a pricing method, style, step count and scheme.
+        """
+        from wqu.pricing import binomial, trinomial
 
-            delta = (price_up - price_down) / (2 * h)
-            deltas.append(delta)
+        S0, K, T, r, sigma = (getattr(self, name)[rows].reshape(-1, 1) for name in self.FIELDS)
+        sign = np.where(self.option_type[rows] == OptionType.CALL.value, 1.0, -1.0).reshape(-1, 1)
+        american = style != OptionStyle.EUROPEAN
 
-        return deltas
+        if method == PricingMethod.BINOMIAL:
+            if scheme == "lr" and n_steps % 2 == 0:
+                n_steps += 1
+            u, d, p = binomial.lattice_parameters(S0, K, T, r, sigma, n_steps, scheme)
+            dt = T / n_steps
+            smoothing = (r, dt, sigma) if scheme == "bbs" else None
+            return binomial._rollback(S0, u, d, p, np.exp(-r * dt), K, sign, n_steps, american,
+                                      smoothing=smoothing)
+        elif method == PricingMethod.TRINOMIAL:
+            u, pu, pm, pd = trinomial.lattice_parameters(T, r, sigma, n_steps)
+            return trinomial._rollback(S0, u, pu, pm, pd, np.exp(-r * T / n_steps), K, sign, n_steps, american)
+        return np.array([self[i].price() for i in rows])
@@ -1,7 +1,58 @@
 # src/wqu/pricing/trinomial.py
 import numpy as np
-from typing import Tuple
-from wqu.pricing.options import OptionType
+from typing import Sequence, Tuple, Union
+from wqu.pricing.options import OptionType, OptionStyle, _payoff_signs
+from wqu.pricing.cache import cached_price
+
+
+def lattice_parameters(T, r, sigma, n_steps: int):
+    """
+    Up factor and risk-neutral probabilities of the trinomial lattice.
+
+    T, r and sigma may be scalars or columns of shape (m, 1).
+
+    Returns:
+        (u, pu, pm, pd)
+    """
+    dt = T / n_steps
+    u = np.exp(sigma * np.sqrt(2 * dt))
+    exp_half_r_dt = np.exp(r * dt / 2)
+    exp_sigma_sqrt_dt = np.exp(sigma * np.sqrt(dt / 2))
+    exp_neg_sigma_sqrt_dt = np.exp(-sigma * np.sqrt(dt / 2))
+
+    pu = ((exp_half_r_dt - exp_neg_sigma_sqrt_dt) / (exp_sigma_sqrt_dt - exp_neg_sigma_sqrt_dt)) ** 2
+    pd = ((exp_sigma_sqrt_dt - exp_half_r_dt) / (exp_sigma_sqrt_dt - exp_neg_sigma_sqrt_dt)) ** 2
+    return u, pu, 1 - pu - pd, pd
+
+
+def _rollback(S0, u, pu, pm, pd, disc, K, sign, n_steps: int, american: bool, keep: int = 0):
+    """
+    Backward induction on a recombining trinomial lattice, one row per option.
+
+    Every argument except n_steps and american may be a scalar or a column of
+    shape (m, 1); node i of step j holds S0 * u^(j-i) as in TrinomialTree.
+    Only one time slice of shape (m, nodes) is kept in memory.
+
+    Returns:
+        Option values at t=0, shape (m,); or, if keep > 0, the list of value
+        slices for steps 0..keep-1
+    """
+    i = np.arange(2 * n_steps + 1)
+    S = S0 * np.exp((n_steps - i) * np.log(u))
+    V = np.maximum(0, sign * (S - K))
+    pu, pm, pd = disc * pu, disc * pm, disc * pd
+    kept = []
+    for j in range(n_steps - 1, -1, -1):
+        V = pu * V[..., :-2] + pm * V[..., 1:-1] + pd * V[..., 2:]
+        if american:
+            S = S[..., 1:-1]
+            np.maximum(V, sign * (S - K), out=V)
+        if j < keep:
+            kept.append(V)
+    if keep:
+        return kept[::-1]
+    return np.atleast_2d(V)[:, 0]
+
 
 class TrinomialTree:
     def __init__(self, S0: float, K: float, T: float, r: float, sigma: float, n_steps: int):
@@ -24,18 +75,28 @@ class TrinomialTree:
         self.n_steps = n_steps
         self.dt = T / n_steps
 
-        # Compute up/down factors
-        self.u = np.exp(sigma * np.sqrt(2 * self.dt))
+        # Up/down factors and risk-neutral probabilities
+        self.u, self.pu, self.pm, self.pd = lattice_parameters(T, r, sigma, n_steps)
         self.d = 1 / self.u
 
-        # Risk-neutral probabilities
-        exp_half_r_dt = np.exp(r * self.dt / 2)
-        exp_sigma_sqrt_dt = np.exp(sigma * np.sqrt(self.dt / 2))
-        exp_neg_sigma_sqrt_dt = np.exp(-sigma * np.sqrt(self.dt / 2))
+        # Discounted probabilities used at every node of the backward induction
+        self.discount = np.exp(-r * self.dt)
+        self._disc_pu = self.discount * self.pu
+        self._disc_pm = self.discount * self.pm
+        self._disc_pd = self.discount * self.pd
+
+        self._node_prices = None
+        self._stock_tree = None
 
-        self.pu = ((exp_half_r_dt - exp_neg_sigma_sqrt_dt) / (exp_sigma_sqrt_dt - exp_neg_sigma_sqrt_dt)) ** 2
-        self.pd = ((exp_sigma_sqrt_dt - exp_half_r_dt) / (exp_sigma_sqrt_dt - exp_neg_sigma_sqrt_dt)) ** 2
-        self.pm = 1 - self.pu - self.pd
+    @property
+    def node_prices(self) -> np.ndarray:
+        """
+        All distinct stock prices of the lattice, S0 * u^(n_steps - k) for k = 0..2*n_steps.
+        Step j uses the centred slice node_prices[n_steps - j: n_steps + j + 1].
+        """
+        if self._node_prices is None:
+            self._node_prices = self.S0 * np.exp((self.n_steps - np.arange(2 * self.n_steps + 1)) * np.log(self.u))
+        return self._node_prices
 
     def _build_stock_tree(self) -> np.ndarray:
         """
@@ -44,14 +105,31 @@ class TrinomialTree:
         Returns:
             np.ndarray: A 2D array representing stock price evolution.
         """
-        tree = np.zeros((2 * self.n_steps + 1, self.n_steps + 1))
-        for j in range(self.n_steps + 1):
-            for i in range(2 * j + 1):
-                shift = j  # Center the tree
-                tree[i, j] = self.S0 * (self.u ** (shift - i))
+        if self._stock_tree is None:
+            i = np.arange(2 * self.n_steps + 1)[:, None]
+            j = np.arange(self.n_steps + 1)[None, :]
+            index = np.minimum(self.n_steps - j + i, 2 * self.n_steps)
+            self._stock_tree = np.where(i <= 2 * j, self.node_prices[index], 0.0)
+        return self._stock_tree
+
+    def _induct(self, option_type: OptionType, american: bool) -> float:
+        """
+        Backward induction on a rolling 1-D buffer of option values.
+        """
+        sign = 1.0 if option_type == OptionType.CALL else -1.0
+        n = self.n_steps
+        nodes = self.node_prices
+        values = np.maximum(0, sign * (nodes - self.K))
 
-        return tree
+        for j in range(n - 1, -1, -1):
+            m = 2 * j + 1
+            values[:m] = self._disc_pu * values[:m] + self._disc_pm * values[1:m + 1] + self._disc_pd * values[2:m + 2]
+            if american:
+                np.maximum(values[:m], sign * (nodes[n - j: n + j + 1] - self.K), out=values[:m])
 
+        return float(values[0])
+
+    @cached_price("n_steps")
     def price_european(self, option_type: OptionType = OptionType.CALL) -> float:
         """
         Price European option using trinomial tree.
@@ -62,27 +140,9 @@ class TrinomialTree:
         Returns:
             Option price
         """
-        stock_tree = self._build_stock_tree()
-        option_tree = np.zeros_like(stock_tree)
-
-        # Terminal payoffs
-        for i in range(2 * self.n_steps + 1):
-            if option_type == OptionType.CALL:
-                option_tree[i, self.n_steps] = max(0, stock_tree[i, self.n_steps] - self.K)
-            else:
-                option_tree[i, self.n_steps] = max(0, self.K - stock_tree[i, self.n_steps])
-
-        # Backward induction
-        for j in range(self.n_steps - 1, -1, -1):
-            for i in range(2 * j + 1):
-                option_tree[i, j] = np.exp(-self.r * self.dt) * (
-                        self.pu * option_tree[i, j + 1] +
-                        self.pm * option_tree[i + 1, j + 1] +
-                        self.pd * option_tree[i + 2, j + 1]
-                )
-
-        return round(option_tree[0, 0], 4)
+        return self._induct(option_type, american=False)
 
+    @cached_price("n_steps")
     def price_american(self, option_type: OptionType = OptionType.CALL) -> float:
         """
         Price American option using trinomial tree.
@@ -93,29 +153,81 @@ class TrinomialTree:
         Returns:
             Option price
         """
-        stock_tree = self._build_stock_tree()
-        option_tree = np.zeros_like(stock_tree)
+        return self._induct(option_type, american=True)
 
-        # Terminal payoffs
-        for i in range(2 * self.n_steps + 1):
-            if option_type == OptionType.CALL:
-                option_tree[i, self.n_steps] = max(0, stock_tree[i, self.n_steps] - self.K)
-            else:
-                option_tree[i, self.n_steps] = max(0, self.K - stock_tree[i, self.n_steps])
+    def price_chain(self, strikes: Sequence[float],
+                    option_types: Union[OptionType, Sequence[OptionType]] = OptionType.CALL,
+                    option_style: OptionStyle = OptionStyle.EUROPEAN) -> np.ndarray:
+        """
+        Price a whole option chain in one backward pass over a (strikes x nodes) array.
 
-        # Backward induction with early exercise
-        for j in range(self.n_steps - 1, -1, -1):
-            for i in range(2 * j + 1):
-                hold_value = np.exp(-self.r * self.dt) * (
-                        self.pu * option_tree[i, j + 1] +
-                        self.pm * option_tree[i + 1, j + 1] +
-                        self.pd * option_tree[i + 2, j + 1]
-                )
+        Args:
+            strikes: Strike prices (the tree's own K is ignored)
+            option_types: One OptionType for all strikes, or one per strike
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN
 
-                exercise_value = max(0, (stock_tree[i, j] - self.K) if option_type == OptionType.CALL else (self.K - stock_tree[i, j]))
-                option_tree[i, j] = max(hold_value, exercise_value)
+        Returns:
+            Option prices aligned with strikes
+        """
+        if option_style not in (OptionStyle.EUROPEAN, OptionStyle.AMERICAN):
+            raise ValueError("price_chain supports only European and American options")
+        K = np.asarray(strikes, dtype=float).reshape(-1, 1)
+        sign = _payoff_signs(option_types, K.shape[0])
+        return _rollback(self.S0, self.u, self.pu, self.pm, self.pd, self.discount, K, sign,
+                         self.n_steps, option_style == OptionStyle.AMERICAN)
+
+    def greeks(self, option_type: OptionType, option_style: OptionStyle = OptionStyle.EUROPEAN,
+               vega_rho: bool = True, dv: float = 0.01, dr: float = 0.0001) -> dict:
+        """
+        Compute price, delta, gamma and theta from a single extended lattice.
+
+        The lattice is started one step before t=0, which already gives the three
+        stock prices S0*u, S0 and S0*d at t=0. Delta and gamma follow from those
+        nodes and theta from the change between the root and the middle node.
+
+        Args:
+            option_type: OptionType.CALL or OptionType.PUT
+            option_style: OptionStyle.EUROPEAN or OptionStyle.AMERICAN
+            vega_rho: Also compute vega (one lattice with sigma + dv) and rho
+                (the same lattice nodes rolled back with r + dr)
+            dv: Volatility bump for vega
+            dr: Interest rate bump for rho
 
-        return round(option_tree[0, 0], 4)
+        Returns:
+            Dictionary with price, delta, gamma, theta and, if requested, vega and rho
+        """
+        if option_style not in (OptionStyle.EUROPEAN, OptionStyle.AMERICAN):
+            raise ValueError("greeks supports only European and American options")
+        american = option_style == OptionStyle.AMERICAN
+        sign = _payoff_signs(option_type, 1)[0, 0]
+        disc = self.discount
+
+        # Extended lattice: n_steps + 1 steps of size dt, rooted at t = -dt
+        V0, V1 = _rollback(self.S0, self.u, self.pu, self.pm, self.pd, disc, self.K, sign,
+                           self.n_steps + 1, american, keep=2)
+        S_u, S_d = self.S0 * self.u, self.S0 * self.d
+        V_u, V_mid, V_d = V1
+        delta_up = (V_u - V_mid) / (S_u - self.S0)
+        delta_down = (V_mid - V_d) / (self.S0 - S_d)
+        result = {
+            "price": V_mid,
+            "delta": (V_u - V_d) / (S_u - S_d),
+            "gamma": (delta_up - delta_down) / (0.5 * (S_u - S_d)),
+            "theta": (V_mid - V0[0]) / self.dt,
+        }
+
+        if vega_rho:
+            bumped = TrinomialTree(self.S0, self.K, self.T, self.r, self.sigma + dv, self.n_steps)
+            price_vol = _rollback(self.S0, bumped.u, bumped.pu, bumped.pm, bumped.pd, disc, self.K, sign,
+                                  self.n_steps, american)[0]
+            # Node prices depend on sigma only, so rho reuses this lattice with new probabilities
+            rate = TrinomialTree(self.S0, self.K, self.T, self.r + dr, self.sigma, self.n_steps)
+            price_rate = _rollback(self.S0, self.u, rate.pu, rate.pm, rate.pd, np.exp(-(self.r + dr) * self.dt),
+                                   self.K, sign, self.n_steps, american)[0]
+            result["vega"] = (price_vol - V_mid) / dv
+            result["rho"] = (price_rate - V_mid) / dr
+
+        return result
 
     def get_trees(self) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -124,4 +236,5 @@ class TrinomialTree:
         Returns:
             Tuple[np.ndarray, np.ndarray]: Stock and option price trees.
         """
-        return self._build_stock_tree(), np.zeros_like(self._build_stock_tree())  # Placeholder for option tree
\ No newline at end of file
+        stock_tree = self._build_stock_tree()
+        return stock_tree, np.zeros_like(stock_tree)  # Placeholder for option tree
\ No newline at end of file
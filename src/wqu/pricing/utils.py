@@ -1,7 +1,9 @@
 # src/wqu/pricing/utils.py
 
+import os
 import numpy as np
 from scipy.stats import norm
+from scipy.special import ndtr
 
 def black_scholes_call(S, K, T, r, sigma):
     """
@@ -28,16 +30,193 @@ def black_scholes_put(S, K, T, r, sigma):
     put_price = K*np.exp(-r*T)*norm.cdf(-d2) - S*norm.cdf(-d1)
     return round(put_price, 2)
 
-def monte_carlo_gbm(S0, r, sigma, T, n_steps, n_sims):
+_BLACK_SCHOLES_BLOCK = 16384
+_BLACK_SCHOLES_GREEKS = ("price", "delta", "gamma", "vega", "theta", "rho")
+
+def black_scholes(S, K, T, r, sigma, is_call=True, greeks=False):
+    """
+    Vectorized Black-Scholes prices, and optionally Greeks, of European options
+
+    All inputs broadcast against each other. Large inputs are evaluated in cache-sized blocks,
+    the normal CDF is scipy.special.ndtr and nothing is rounded. At T = 0 or sigma = 0 the
+    prices are the discounted intrinsic values max(0, +-(S - K*exp(-r*T))), with the matching
+    limits of the Greeks.
+
+    Parameters:
+    S: Current stock price
+    K: Strike price
+    T: Time to maturity (in years)
+    r: Risk-free interest rate (annual)
+    sigma: Volatility of the stock
+    is_call: True (or 1) for calls, False (or 0) for puts
+    greeks: Also return delta, gamma, vega, theta (per year) and rho
+
+    Returns:
+    Array of prices, or a dict of arrays with price, delta, gamma, vega, theta and rho
+    """
+    n_out = len(_BLACK_SCHOLES_GREEKS) if greeks else 1
+    # Accept 0/1 flags as well as booleans
+    is_call = np.asarray(is_call).astype(bool, copy=False)
+    it = np.nditer(
+        [S, K, T, r, sigma, is_call] + [None] * n_out,
+        flags=["external_loop", "buffered", "zerosize_ok", "refs_ok"],
+        op_flags=[["readonly"]] * 6 + [["writeonly", "allocate"]] * n_out,
+        op_dtypes=[np.float64] * 5 + [np.bool_] + [np.float64] * n_out,
+        buffersize=_BLACK_SCHOLES_BLOCK,
+    )
+    with it:
+        for operands in it:
+            values = _black_scholes_block(*operands[:6], greeks)
+            for out, value in zip(operands[6:], values):
+                out[...] = value
+        results = [result[()] for result in it.operands[6:]]
+    if greeks:
+        return dict(zip(_BLACK_SCHOLES_GREEKS, results))
+    return results[0]
+
+def _black_scholes_block(S, K, T, r, sigma, is_call, greeks):
+    """Black-Scholes kernel on equally shaped 1-D blocks; returns (price,) or all Greeks"""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_T = np.sqrt(T)
+    vol = sigma*sqrt_T
+    discounted_K = K*np.exp(-r*T)
+    log_moneyness = np.log(S/discounted_K)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = log_moneyness/vol
+        d1 += 0.5*vol
+        degenerate = vol <= 0
+        if degenerate.any():
+            # Deterministic limit: the option ends in or out of the money for sure
+            limit = np.where(log_moneyness == 0, 0.0, np.copysign(np.inf, log_moneyness))
+            d1 = np.where(degenerate, limit, d1)
+        # The cdf arguments sign*d1 and sign*d2 are built in place
+        x = sign*d1
+        N1 = ndtr(x)
+        x -= sign*vol
+        N2 = ndtr(x)
+        price = S*N1
+        price -= discounted_K*N2
+        price *= sign
+        if not greeks:
+            return (price,)
+
+        pdf = np.exp(-0.5*d1**2)/np.sqrt(2*np.pi)
+        gamma = np.where(degenerate, 0.0, pdf/(S*vol))
+        theta = np.where(degenerate, 0.0, -S*pdf*sigma/(2*sqrt_T)) - sign*r*discounted_K*N2
+    return price, sign*N1, gamma, S*pdf*sqrt_T, theta, sign*T*discounted_K*N2
+
+def _black_scholes_price(S, K, T, r, sigma, sign):
+    """Black-Scholes price for array inputs; sign is +1 for calls and -1 for puts"""
+    return black_scholes(S, K, T, r, sigma, np.asarray(sign) > 0)
+
+def _black_scholes_delta(S, K, T, r, sigma, sign):
+    """Black-Scholes delta for array inputs; sign is +1 for calls and -1 for puts"""
+    return black_scholes(S, K, T, r, sigma, np.asarray(sign) > 0, greeks=True)["delta"]
+
+def leisen_reimer_parameters(S0, K, T, r, sigma, n_steps):
+    """
+    Up/down factors and risk-neutral probability of the Leisen-Reimer (1996) binomial tree
+
+    The tree is centred on the strike through the Peizer-Pratt (method 2) inversion of the
+    normal distribution, and its prices converge at O(1/n^2) instead of oscillating at O(1/n).
+    n_steps should be odd.
+
+    Returns:
+    (u, d, p)
+    """
+    def peizer_pratt(z):
+        return 0.5 + np.sign(z)*np.sqrt(0.25 - 0.25*np.exp(-(z/(n_steps + 1/3))**2 * (n_steps + 1/6)))
+
+    dt = T/n_steps
+    d1 = (np.log(S0/K) + (r + sigma**2/2)*T) / (sigma*np.sqrt(T))
+    d2 = d1 - sigma*np.sqrt(T)
+    p = peizer_pratt(d2)
+    u = np.exp(r*dt) * peizer_pratt(d1) / p
+    d = (np.exp(r*dt) - p*u) / (1 - p)
+    return u, d, p
+
+def monte_carlo_gbm(S0, r, sigma, T, n_steps, n_sims, dtype=np.float64, out=None, block_size=None, rng=None):
     """
     Generate Monte Carlo paths using Geometric Brownian Motion
+
+    Paths are simulated in blocks of block_size rows (see monte_carlo_gbm_blocks). With the
+    default single block and rng=None the draws are the same as one np.random.standard_normal(n_sims)
+    per time step.
+
+    Parameters:
+    dtype: np.float64 or np.float32
+    out: Array of shape (n_sims, n_steps+1) to fill, or a file name for a new .npy memory map
+    block_size: Paths per block (default n_sims, or 65536 when writing to a file)
+    rng: np.random.Generator to draw from (default the global np.random state)
+
+    Returns:
+    Array (or memory map) of shape (n_sims, n_steps+1)
+    """
+    shape = (n_sims, n_steps+1)
+    if out is None:
+        paths = np.empty(shape, dtype=dtype)
+    elif isinstance(out, (str, os.PathLike)):
+        paths = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=shape)
+        block_size = block_size or 65536
+    else:
+        paths = out
+        if paths.shape != shape:
+            raise ValueError(f"out must have shape {shape}")
+
+    start = 0
+    for block in monte_carlo_gbm_blocks(S0, r, sigma, T, n_steps, n_sims, block_size or n_sims, dtype, rng=rng):
+        paths[start:start+len(block)] = block
+        start += len(block)
+    if isinstance(paths, np.memmap):
+        paths.flush()
+    return paths
+
+def monte_carlo_gbm_blocks(S0, r, sigma, T, n_steps, n_sims, block_size=65536, dtype=np.float64,
+                           stats_only=False, rng=None):
+    """
+    Yield Geometric Brownian Motion paths block by block, so memory does not grow with n_sims
+
+    Parameters:
+    block_size: Number of paths per block
+    dtype: np.float64 or np.float32
+    stats_only: Yield per-path running statistics instead of paths: a dict with the
+        terminal price, the sum of all n_steps+1 prices (for averages), and the maximum
+        and minimum price of each path
+    rng: np.random.Generator to draw from (default the global np.random state)
+
+    Yields:
+    Arrays of shape (block, n_steps+1), or dicts of arrays of shape (block,)
     """
     dt = T/n_steps
-    paths = np.zeros((n_sims, n_steps+1))
-    paths[:,0] = S0
+    drift = dtype((r - 0.5*sigma**2)*dt)
+    vol = dtype(sigma*np.sqrt(dt))
+
+    for start in range(0, n_sims, block_size):
+        m = min(block_size, n_sims - start)
+        S = np.full(m, S0, dtype=dtype)
+        if stats_only:
+            total, high, low = S.copy(), S.copy(), S.copy()
+        else:
+            paths = np.empty((m, n_steps+1), dtype=dtype)
+            paths[:,0] = S
 
-    for t in range(1, n_steps+1):
-        z = np.random.standard_normal(n_sims)
-        paths[:,t] = paths[:,t-1] * np.exp((r - 0.5*sigma**2)*dt + sigma*np.sqrt(dt)*z)
+        for t in range(1, n_steps+1):
+            if rng is None:
+                z = np.random.standard_normal(m).astype(dtype, copy=False)
+            else:
+                z = rng.standard_normal(m, dtype=dtype)
+            z *= vol
+            z += drift
+            S *= np.exp(z)
+            if stats_only:
+                total += S
+                np.maximum(high, S, out=high)
+                np.minimum(low, S, out=low)
+            else:
+                paths[:,t] = S
 
-    return paths
\ No newline at end of file
+        if stats_only:
+            yield {"terminal": S, "sum": total, "max": high, "min": low}
+        else:
+            yield paths